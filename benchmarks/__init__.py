@@ -0,0 +1,16 @@
+"""
+Benchmarks for pymodeler.
+
+Run all the benchmarks and save the results as a JSON baseline::
+
+    python -m benchmarks run --output baseline.json
+
+Run them again after a change and compare, flagging any benchmark
+that is more than 10% slower::
+
+    python -m benchmarks run --output new.json
+    python -m benchmarks compare baseline.json new.json --threshold 0.1
+
+Benchmarks are registered with `benchmarks.harness.benchmark` in the
+`bench_*.py` modules of this package.
+"""
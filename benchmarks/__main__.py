@@ -0,0 +1,6 @@
+"""Command line interface to the benchmarks (see `benchmarks`)"""
+import sys
+
+from benchmarks.harness import main
+
+sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Benchmarks of attribute access and setp.
+"""
+import numpy as np
+
+from pymodeler import Parameter, FloatParameter
+
+from benchmarks.harness import benchmark
+from benchmarks.models import make_model
+
+PARAM_CLASSES = {'Parameter': Parameter, 'FloatParameter': FloatParameter}
+VALUE_TYPES = {'float': float, 'int': int, 'float64': np.float64}
+
+
+@benchmark(storage=['object', 'array'])
+def read_attribute(storage):
+    """Read a parameter value, m.p1"""
+    m = make_model(10, _array_storage=(storage == 'array'))()
+    m.p1 = 1.5
+    return lambda: m.p1
+
+
+@benchmark()
+def read_getp():
+    """Read a parameter value with m.getp('p1').value"""
+    m = make_model(10)()
+    return lambda: m.getp('p1').value
+
+
+@benchmark(storage=['object', 'array'])
+def write_attribute(storage):
+    """Set a parameter value, m.p1 = x"""
+    m = make_model(10, _array_storage=(storage == 'array'))()
+    return lambda: setattr(m, 'p1', 2.0)
+
+
+@benchmark(storage=['object', 'array'], param=['Parameter', 'FloatParameter'])
+def setp(storage, param):
+    """Set a parameter value with m.setp('p1', value=x)"""
+    m = make_model(10, param_cls=PARAM_CLASSES[param],
+                   _array_storage=(storage == 'array'))()
+    return lambda: m.setp('p1', value=2.0)
+
+
+@benchmark(param=['Parameter', 'FloatParameter'], vtype=['float', 'int', 'float64'])
+def set_value(param, vtype):
+    """Set the value of a bounded Parameter, p.set_value(x)"""
+    p = PARAM_CLASSES[param](value=1.0, bounds=[0, 10])
+    value = VALUE_TYPES[vtype](2)
+    return lambda: p.set_value(value)
+
+
+@benchmark(nparams=[10, 100])
+def set_attributes(nparams):
+    """Set all the parameters with set_attributes"""
+    m = make_model(nparams)()
+    kwargs = {'p%i' % i: float(i) + 0.5 for i in range(nparams)}
+    return lambda: m.set_attributes(**kwargs)
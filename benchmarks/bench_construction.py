@@ -0,0 +1,47 @@
+"""
+Benchmarks of Model construction.
+"""
+from benchmarks.harness import benchmark
+from benchmarks.models import make_model
+
+
+@benchmark(nparams=[10, 100, 1000])
+def construct(nparams):
+    """Build a Model with the default values"""
+    return make_model(nparams)
+
+
+@benchmark(nparams=[10, 100, 1000])
+def construct_kwargs(nparams):
+    """Build a Model setting two parameters"""
+    cls = make_model(nparams)
+    return lambda: cls(p0=1.0, p1=dict(value=2.0, free=True))
+
+
+@benchmark(nparams=[10, 100, 1000])
+def construct_array_storage(nparams):
+    """Build a Model with array storage"""
+    return make_model(nparams, _array_storage=True)
+
+
+@benchmark(nparams=[10, 100], form=['scalar', 'dict'])
+def construct_records(nparams, form):
+    """Build a Model setting every parameter, from scalars or dicts of fields"""
+    cls = make_model(nparams)
+    if form == 'dict':
+        kwargs = {'p%i' % i: dict(value=float(i) + 0.5, bounds=[-10., 1e3], free=True)
+                  for i in range(nparams)}
+    else:
+        kwargs = {'p%i' % i: float(i) + 0.5 for i in range(nparams)}
+    return lambda: cls(**kwargs)
+
+
+@benchmark(nparams=[10, 100], form=['loop', 'from_records'])
+def construct_catalogue(nparams, form):
+    """Build 1000 Models from a mapping of columns"""
+    cls = make_model(nparams)
+    columns = {'p%i' % i: [float(i) + 0.5] * 1000 for i in range(nparams)}
+    if form == 'loop':
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        return lambda: [cls(**row) for row in rows]
+    return lambda: cls.from_records(columns)
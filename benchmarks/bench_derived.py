@@ -0,0 +1,128 @@
+"""
+Benchmarks of Derived properties.
+"""
+from collections import OrderedDict as odict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pymodeler import Derived
+
+from benchmarks.harness import benchmark
+from benchmarks.models import make_model, make_wide_model
+
+
+@benchmark(depth=[1, 5], size=[1, 10000], threadsafe=[False, True])
+def derived_cached(depth, size, threadsafe):
+    """Read the last Derived property of the chain, once computed"""
+    m = make_model(10, depth, size, _threadsafe=threadsafe)()
+    name = 'd%i' % (depth - 1)
+    getattr(m, name)
+    return lambda: getattr(m, name)
+
+
+@benchmark(depth=[1, 5], size=[1, 10000])
+def derived_recompute(depth, size):
+    """Change the first parameter and recompute the whole chain"""
+    m = make_model(10, depth, size)()
+    name = 'd%i' % (depth - 1)
+
+    def func():
+        m.p0 = 1.0
+        getattr(m, name)
+    return func
+
+
+@benchmark(depth=[5])
+def derived_unrelated(depth):
+    """Change a parameter that the Derived properties don't use"""
+    m = make_model(10, depth, 1000)()
+    name = 'd%i' % (depth - 1)
+
+    def func():
+        m.p5 = 1.0
+        getattr(m, name)
+    return func
+
+
+@benchmark(method=['loop', 'serial', 'processes'])
+def map_derived(method):
+    """Evaluate a Derived property (size 10000) at 1000 parameter points"""
+    m = make_model(10, 1, 10000)()
+    values = np.linspace(0, 1, 1000)
+    if method == 'loop':
+        def func():
+            ret = []
+            for value in values:
+                m.p0 = value
+                ret.append(m.d0)
+            return np.array(ret)
+        return func
+    if method == 'serial':
+        return lambda: m.map_derived('d0', dict(p0=values))
+
+    def func():
+        with ProcessPoolExecutor(2) as pool:
+            return m.map_derived('d0', dict(p0=values), executor=pool)
+    return func
+
+
+@benchmark(method=['loop', 'materialize'], width=[8])
+def materialize(method, width):
+    """Compute independent Derived properties (400 x 400 matrix products)"""
+    m = make_wide_model(width, 400)()
+    names = ['w%i' % i for i in range(width)]
+    if method == 'loop':
+        def func():
+            m.clear_derived()
+            for name in names:
+                getattr(m, name)
+        return func
+
+    def func():
+        m.clear_derived()
+        m.materialize()
+    return func
+
+
+@benchmark(mode=['setp', 'background'])
+def write_cached(mode):
+    """Set p0 when the cache is updated with the Derived d0 (size 10**6)"""
+    if mode == 'setp':
+        # The cache hook computes d0 in setp
+        cls = make_model(10, 1, 10**6, _cache=lambda self, name=None: self.d0)
+    else:
+        cls = make_model(10, 1, 10**6, _background_cache=0.05)
+    m = cls()
+    m.d0
+    values = iter(np.linspace(0, 1, 10**7))
+    return lambda: setattr(m, 'p0', next(values))
+
+
+@benchmark(loader=['full', 'incremental'])
+def incremental(loader):
+    """Change a normalisation and read a Derived array (size 10**5)"""
+    grid = np.linspace(0, 1, 10**5)
+    base = make_model(10, 0)
+
+    class Spectrum(base):
+        _params = odict(base._params, flux=Derived(dtype=np.ndarray))
+
+        def _flux(self):
+            return self.p0 * np.exp(-grid / (1. + self.p1)) / (1. + grid**self.p2)
+
+        if loader == 'incremental':
+            def _flux_update(self, old, changes):
+                if list(changes) != ['p0'] or changes['p0'][0] == 0:
+                    return NotImplemented
+                old_norm, new_norm = changes['p0']
+                return old * (new_norm / old_norm)
+
+    m = Spectrum(p0=1.0)
+    m.flux
+    values = iter(np.linspace(1, 2, 10**7))
+
+    def func():
+        m.p0 = next(values)
+        return m.flux
+    return func
@@ -0,0 +1,52 @@
+"""
+Benchmarks of the memory used per Parameter.
+"""
+import copy
+import tracemalloc
+
+from pymodeler import Parameter
+
+from benchmarks.harness import benchmark
+from benchmarks.models import make_model
+
+
+def _bytes_per(build, count):
+    """Bytes allocated per object by build(), averaged over count objects"""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        objs = [build() for _ in range(count)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objs
+    return (end - start) / count
+
+
+@benchmark(unit='bytes')
+def parameter_bytes():
+    """Bytes per Parameter declaration"""
+    return _bytes_per(lambda: Parameter(value=1.0, bounds=[0, 10],
+                                        errors=[0.1, 0.1], help="A parameter",
+                                        unit="km"), 10000)
+
+
+@benchmark(unit='bytes')
+def parameter_copy_bytes():
+    """Bytes per copy of a Parameter (e.g., owned by a Model instance)"""
+    param = Parameter(value=1.0, bounds=[0, 10], errors=[0.1, 0.1],
+                      help="A parameter", unit="km")
+    return _bytes_per(lambda: copy.deepcopy(param), 10000)
+
+
+@benchmark(unit='bytes', nparams=[100])
+def model_bytes_per_parameter(nparams):
+    """Bytes per Parameter of a Model instance with all its Parameters owned"""
+    cls = make_model(nparams)
+
+    def build():
+        model = cls()
+        for i in range(nparams):
+            model.getp('p%i' % i)
+        return model
+    return _bytes_per(build, 100) / nparams
@@ -0,0 +1,136 @@
+"""
+Benchmarks of parameter vectors and serialization.
+"""
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from benchmarks.models import make_model
+
+
+@benchmark(nparams=[10, 100, 1000], storage=['object', 'array'])
+def param_values(nparams, storage):
+    """Get all the parameter values as an array"""
+    m = make_model(nparams, _array_storage=(storage == 'array'))()
+    return m.param_values
+
+
+@benchmark(nparams=[10, 100, 1000], storage=['object', 'array'])
+def set_free_values(nparams, storage):
+    """Set the free parameter values from an array"""
+    m = make_model(nparams, _array_storage=(storage == 'array'))()
+    values = np.arange(len(m.free_names()), dtype=float)
+
+    def func():
+        values[0] += 1
+        m.set_free_values(values)
+    return func
+
+
+@benchmark(nparams=[10, 100])
+def todict(nparams):
+    """Convert a Model to a dictionary"""
+    return make_model(nparams)().todict
+
+
+@benchmark(nparams=[10, 100])
+def dump(nparams):
+    """Dump a Model as a YAML string"""
+    return make_model(nparams)().dump
+
+
+@benchmark(nparams=[10, 100])
+def to_record(nparams):
+    """Convert a Model to a structured record"""
+    return make_model(nparams)().to_record
+
+
+@benchmark(nparams=[10, 100])
+def from_record(nparams):
+    """Build a Model from a structured record"""
+    cls = make_model(nparams)
+    record = cls().to_record()
+    return lambda: cls.from_record(record)
+
+
+@benchmark(nparams=[10, 100])
+def from_yaml(nparams):
+    """Build a Model from the output of dump()"""
+    cls = make_model(nparams)
+    text = cls().dump()
+    return lambda: cls.from_yaml(text)
+
+
+@benchmark(nparams=[10])
+def dump_all(nparams):
+    """Dump 1000 Models as a stream of yaml documents"""
+    cls = make_model(nparams)
+    models = [cls() for _ in range(1000)]
+    return lambda: cls.dump_all(models)
+
+
+@benchmark(nparams=[10])
+def from_yaml_all(nparams):
+    """Read 1000 Models from a stream of yaml documents"""
+    cls = make_model(nparams)
+    text = cls.dump_all(cls() for _ in range(1000))
+    return lambda: list(cls.from_yaml_all(text))
+
+
+# Scratch directory for the snapshot benchmarks (removed at exit)
+_TMPDIR = tempfile.TemporaryDirectory()
+
+
+@benchmark(size=[10**6])
+def write_raw(size):
+    """Write the bytes of a float array (reference for save_snapshot)"""
+    filename = os.path.join(_TMPDIR.name, 'raw.bin')
+    array = np.zeros(size)
+
+    def func():
+        with open(filename, 'wb') as f:
+            f.write(array)
+    return func
+
+
+@benchmark(size=[10**6])
+def save_snapshot(size):
+    """Write a snapshot of a Model with a Derived array"""
+    m = make_model(10, size=size)()
+    m.d0
+    filename = os.path.join(_TMPDIR.name, 'model.snap')
+    return lambda: m.save_snapshot(filename)
+
+
+# The restored models are only freed by the garbage collector (their
+# loaders are bound methods), and each one keeps the file mapped
+@benchmark(gc=True, size=[10**6], mmap_mode=[True, False])
+def load_snapshot(size, mmap_mode):
+    """Restore a Model with a Derived array from a snapshot"""
+    cls = make_model(10, size=size)
+    m = cls()
+    m.d0
+    filename = os.path.join(_TMPDIR.name, 'model_%i.snap' % size)
+    m.save_snapshot(filename)
+    return lambda: cls.load_snapshot(filename, mmap_mode)
+
+
+@benchmark(unit='bytes', nparams=[10, 100], size=[1, 10**5])
+def pickle_bytes(nparams, size):
+    """Bytes to send a Model (all parameters set, Derived computed) to a worker"""
+    m = make_model(nparams, size=size)(p0=1.0)
+    m.set_param_values(np.arange(nparams, dtype=float) + 0.5)
+    m.d0
+    return len(pickle.dumps(m, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark(nparams=[10, 100], size=[1, 10**5])
+def pickle_roundtrip(nparams, size):
+    """Pickle and unpickle a Model (all parameters set, Derived computed)"""
+    m = make_model(nparams, size=size)(p0=1.0)
+    m.set_param_values(np.arange(nparams, dtype=float) + 0.5)
+    m.d0
+    return lambda: pickle.loads(pickle.dumps(m, protocol=pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,184 @@
+"""
+Minimal benchmark harness.
+
+Each benchmark is a function, registered with the `benchmark`
+decorator, that does the setup and returns the callable to be timed.
+A benchmark can be run for several sets of parameters; each set is
+reported as 'name[key=value,...]'.
+
+Benchmarks registered with unit='bytes' (or any unit other than
+seconds) return the measured value directly instead of a callable.
+
+The garbage collector is disabled while a callable is timed (as
+`timeit` does), unless the benchmark is registered with gc=True.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import sys
+import timeit
+from collections import OrderedDict as odict
+
+# name -> (function, parameter grid, unit, gc)
+BENCHMARKS = odict()
+
+
+def benchmark(name=None, unit='s', gc=False, **grid):
+    """Register a benchmark function.
+
+    Parameters
+    ----------
+    name : str or None
+        Name of the benchmark, default is the function name.
+    unit : str
+        's' to time the callable returned by the function, otherwise
+        the unit of the value returned by the function.
+    gc : bool
+        Keep the garbage collector enabled while timing, for callables
+        that leave reference cycles holding resources (e.g., files).
+    grid :
+        Lists of values for each keyword argument of the function;
+        the benchmark is run for every combination.
+    """
+    def decorator(func):
+        BENCHMARKS[name or func.__name__] = (func, grid, unit, gc)
+        return func
+    return decorator
+
+
+def load():
+    """Import all the bench_*.py modules to register their benchmarks"""
+    path = os.path.dirname(__file__)
+    for module in pkgutil.iter_modules([path]):
+        if module.name.startswith('bench_'):
+            importlib.import_module('benchmarks.' + module.name)
+
+
+def cases(select=None):
+    """Yield (label, function, kwargs, unit, gc) for every benchmark case"""
+    for name, (func, grid, unit, gc) in BENCHMARKS.items():
+        keys = list(grid)
+        for values in itertools.product(*[grid[k] for k in keys]):
+            kwargs = odict(zip(keys, values))
+            label = name
+            if kwargs:
+                label += '[%s]' % ','.join('%s=%s' % kv for kv in kwargs.items())
+            if select and not any(s in label for s in select):
+                continue
+            yield label, func, kwargs, unit, gc
+
+
+def measure(func, kwargs, unit, repeat=5, min_time=0.2, gc=False):
+    """Run one benchmark case.
+
+    Time benchmarks return the best time per call (in seconds) out of
+    `repeat` runs of about `min_time` seconds each.
+    """
+    result = func(**kwargs)
+    if unit != 's':
+        return float(result)
+    timer = timeit.Timer(result, setup='gc.enable()' if gc else 'pass')
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(select=None, repeat=5, min_time=0.2, stream=sys.stdout):
+    """Run the benchmarks and return the results as a dictionary"""
+    import pymodeler
+    load()
+    results = odict()
+    for label, func, kwargs, unit, gc in cases(select):
+        value = measure(func, kwargs, unit, repeat=repeat, min_time=min_time, gc=gc)
+        results[label] = odict([('value', value), ('unit', unit)])
+        if stream is not None:
+            stream.write('%-55s %s\n' % (label, format_value(value, unit)))
+            stream.flush()
+    return odict([
+        ('pymodeler', pymodeler.__version__),
+        ('python', platform.python_version()),
+        ('machine', platform.machine()),
+        ('platform', platform.platform()),
+        ('results', results),
+    ])
+
+
+def format_value(value, unit):
+    """Format a result for printing"""
+    if unit != 's':
+        return '%12.1f %s' % (value, unit)
+    for scale, prefix in [(1e-6, 'ns'), (1e-3, 'us'), (1, 'ms')]:
+        if value < scale:
+            return '%12.2f %s' % (value / scale * 1e3, prefix)
+    return '%12.2f s' % value
+
+
+def compare(old, new, threshold=0.1, stream=sys.stdout):
+    """Compare two sets of results.
+
+    Returns the labels of the benchmarks whose value grew by more than
+    `threshold` (as a fraction of the old value).
+    """
+    regressions = []
+    for label, result in new['results'].items():
+        if label not in old['results']:
+            continue
+        before = old['results'][label]['value']
+        after = result['value']
+        ratio = after / before if before else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(label)
+            flag = 'REGRESSION'
+        elif ratio < 1 - threshold:
+            flag = 'improved'
+        if stream is not None:
+            unit = result['unit']
+            stream.write('%-55s %s %s %6.2fx %s\n' % (
+                label, format_value(before, unit), format_value(after, unit),
+                ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    """Command line interface"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__)
+    sub = parser.add_subparsers(dest='command')
+    run_parser = sub.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='JSON file for the results')
+    run_parser.add_argument('-k', '--select', action='append',
+                            help='only run benchmarks containing this string')
+    run_parser.add_argument('-r', '--repeat', type=int, default=5)
+    run_parser.add_argument('-t', '--min-time', type=float, default=0.2,
+                            help='approximate time of each repeat (s)')
+    cmp_parser = sub.add_parser('compare', help='compare two JSON results')
+    cmp_parser.add_argument('old')
+    cmp_parser.add_argument('new')
+    cmp_parser.add_argument('--threshold', type=float, default=0.1,
+                            help='fractional slow-down flagged as a regression')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.select, repeat=args.repeat, min_time=args.min_time)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+    if args.command == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, threshold=args.threshold)
+        if regressions:
+            print('%i regression(s) above %.0f%%' % (len(regressions),
+                                                    100 * args.threshold))
+            return 1
+        return 0
+    parser.print_help()
+    return 2
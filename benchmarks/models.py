@@ -0,0 +1,101 @@
+"""
+Synthetic models for the benchmarks.
+"""
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler import Model, Parameter, Property, Derived
+
+# The Model classes built by make_model
+_CLASSES = {}
+
+
+def make_model(nparams=10, depth=1, size=1, param_cls=Parameter, **attrs):
+    """
+    Build a Model sub-class for benchmarking.
+
+    Parameters
+    ----------
+    nparams : int
+        Number of Parameters ('p0', 'p1', ...).
+    depth : int
+        Length of the chain of Derived properties ('d0' depends on
+        'p0', 'd1' on 'd0', etc.).
+    size : int
+        Size of the arrays computed by the Derived properties.
+    param_cls : type
+        The class of the Parameters (e.g., FloatParameter).
+    attrs :
+        Other class attributes (e.g., _array_storage=True).
+
+    Returns
+    -------
+    cls : type
+        The Model sub-class.
+    """
+    params = odict([('p%i' % i, param_cls(value=float(i), bounds=[-1e9, 1e9],
+                                           free=(i % 2 == 0)))
+                    for i in range(nparams)])
+    params['label'] = Property(default='synthetic', dtype=str)
+    grid = np.linspace(0, 1, size)
+
+    def loader(level):
+        """Loader for the Derived property at one level of the chain"""
+        if level == 0:
+            return lambda self: grid * self.p0
+        previous = 'd%i' % (level - 1)
+        return lambda self: getattr(self, previous) + 1.
+
+    for level in range(depth):
+        name = 'd%i' % level
+        params[name] = Derived(dtype=np.ndarray)
+        attrs['_' + name] = loader(level)
+
+    attrs['_params'] = params
+    return _register('Model_%i_%i_%i' % (nparams, depth, size), attrs)
+
+
+def make_wide_model(width=8, size=100, **attrs):
+    """
+    Build a Model sub-class with independent Derived properties.
+
+    Parameters
+    ----------
+    width : int
+        Number of Derived properties ('w0', 'w1', ...), each depending
+        only on the Parameter 'p0'.
+    size : int
+        Each loader computes the product of two (size x size) matrices.
+    attrs :
+        Other class attributes.
+
+    Returns
+    -------
+    cls : type
+        The Model sub-class.
+    """
+    params = odict([('p0', Parameter(value=1.0, bounds=[-1e9, 1e9]))])
+    matrix = np.random.RandomState(0).uniform(size=(size, size))
+
+    def loader(level):
+        """Loader for one of the Derived properties"""
+        return lambda self: np.dot(matrix, matrix) * (self.p0 + level)
+
+    for level in range(width):
+        name = 'w%i' % level
+        params[name] = Derived(dtype=np.ndarray)
+        attrs['_' + name] = loader(level)
+
+    attrs['_params'] = params
+    return _register('Wide_%i_%i' % (width, size), attrs)
+
+
+def _register(prefix, attrs):
+    """Create the Model sub-class, under a unique name in this module"""
+    name = '%s_%i' % (prefix, len(_CLASSES))
+    cls = type(name, (Model,), attrs)
+    # Importable by name, so that the instances can be pickled
+    cls.__module__ = __name__
+    globals()[name] = _CLASSES[name] = cls
+    return cls
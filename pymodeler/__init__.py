@@ -9,5 +9,6 @@ from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
 
-from .parameter import Property, Derived, Parameter, Param
+from .parameter import Property, Derived, Parameter, Param, FloatParameter
 from .model import Model
+from .batch import ModelBatch
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+"""
+A ModelBatch is an ensemble of parameter sets for one Model class.
+
+Rather than one Model instance (with its own Property objects) per
+parameter point, the batch stores each Parameter as a column of a
+numpy array. Properties that are not given as columns take their
+default value for all rows.
+
+Derived properties are computed for all rows at once. If the Derived
+property is flagged as 'vectorized', the loader is called once with
+the columns in place of the parameter values; otherwise it is called
+once per row on a scratch Model instance.
+
+Examples::
+
+    batch = ModelBatch(ModelExample, distance=np.linspace(1, 100, 100000))
+    batch.distance          # The column of distances
+    batch.fuel_needed       # The Derived property for every row
+    batch.row(10)           # A ModelExample instance for one row
+"""
+from __future__ import absolute_import, division, print_function
+
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler.parameter import Derived, Parameter
+
+
+class BatchColumns:
+    """Stand-in for a Model instance that is passed to vectorized
+    loaders, with attribute access to the columns of a `ModelBatch`.
+    """
+
+    def __init__(self, batch):
+        self._batch = batch
+
+    def __getattr__(self, name):
+        try:
+            return self._batch.column(name)
+        except KeyError as msg:
+            raise AttributeError(name) from msg
+
+
+class ModelBatch:
+    """Structure-of-arrays ensemble of N parameter sets for one `Model` class.
+
+    Parameters
+    ----------
+    model : type
+        The `pymodeler.Model` sub-class.
+    size : int or None
+        Number of rows. If None, taken from the length of the columns.
+    kwargs :
+        Columns (or scalar values) of the parameters and properties.
+    """
+
+    def __init__(self, model, size=None, **kwargs):
+        self._model = model
+        self._columns = odict()
+        self._derived = {}
+        self._scratch = None
+
+        if size is None:
+            lengths = [len(v) for v in kwargs.values() if np.ndim(v) > 0]
+            size = lengths[0] if lengths else 1
+        self._size = int(size)
+
+        for name, value in kwargs.items():
+            self.set_column(name, value)
+
+    def __len__(self):
+        return self._size
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.column(name)
+        except KeyError as msg:
+            raise AttributeError(name) from msg
+
+    @property
+    def model(self):
+        """The `Model` class of this batch"""
+        return self._model
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by the columns and Derived values"""
+        arrays = list(self._columns.values()) + list(self._derived.values())
+        return sum(a.nbytes for a in arrays)
+
+    def _resolve(self, name):
+        """Resolve a mapped name, raising KeyError for unknown names"""
+        name = self._model._mapping.get(name, name)
+        if name not in self._model._params:
+            raise KeyError(name)
+        return name
+
+    def column(self, name):
+        """
+        Return the values of the named property for all rows.
+
+        Parameters and properties that have not been set take their
+        default value. Derived properties are computed on first access.
+
+        Parameters
+        ----------
+        name : str
+            The property name.
+
+        Returns
+        -------
+        values : `~numpy.ndarray`
+            Array of length `len(self)`.
+        """
+        name = self._resolve(name)
+        if name in self._columns:
+            return self._columns[name]
+        prop = self._model._params[name]
+        if isinstance(prop, Derived):
+            if name not in self._derived:
+                self._derived[name] = self._load_derived(name)
+            return self._derived[name]
+        return np.full(self._size, prop.value, dtype=self._dtype(prop))
+
+    def set_column(self, name, values):
+        """
+        Set the values of the named property for all rows.
+
+        The values are type- and bounds-checked as whole columns.
+        Setting a column clears the Derived properties.
+
+        Parameters
+        ----------
+        name : str
+            The property name.
+        values : array-like or scalar
+            The values, broadcast to `len(self)`.
+        """
+        name = self._resolve(name)
+        prop = self._model._params[name]
+        if isinstance(prop, Derived):
+            raise TypeError("Can not set Derived property %s" % name)
+        dtype = self._dtype(prop)
+        # Check the input before it is converted to the column dtype
+        values = np.asarray(values, dtype=object if dtype is object else None)
+        if values.size and values.dtype == object:
+            for value in values.flat:
+                prop.check_type(value)
+        elif values.size:
+            prop.check_type(values.flat[0].item())
+        try:
+            values = np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError) as msg:
+            raise TypeError("Failed to set parameter %s" % name) from msg
+        values = np.broadcast_to(values, (self._size,)).copy()
+
+        bounds = getattr(prop, 'bounds', None)
+        if bounds is not None:
+            # NaN is outside the bounds, as in Parameter.check_bounds
+            outside = ~((bounds[0] <= values) & (values <= bounds[1]))
+            if outside.any():
+                row = np.flatnonzero(outside)[0]
+                msg = "Value of %s outside bounds in row %i: %.2g [%.2g,%.2g]"
+                msg = msg % (name, row, values[row], bounds[0], bounds[1])
+                raise ValueError(msg)
+
+        self._columns[name] = values
+        self.clear_derived()
+
+    def clear_derived(self):
+        """ Clear the Derived properties of all rows """
+        self._derived.clear()
+
+    @staticmethod
+    def _dtype(prop):
+        """ Numpy dtype of the column for a Property """
+        if isinstance(prop, Parameter):
+            if prop.dtype is None or isinstance(0.0, prop.dtype):
+                return float
+            return None
+        if prop.dtype in (int, float, bool):
+            return prop.dtype
+        if prop.dtype is str:
+            return None
+        return object
+
+    def _kwargs(self, index):
+        """ Keyword arguments to build the Model for one row """
+        return odict((k, v[index].item() if v.dtype != object else v[index])
+                     for k, v in self._columns.items())
+
+    def row(self, index):
+        """ Return a `Model` instance for one row """
+        return self._model(**self._kwargs(index))
+
+    def _load_derived(self, name):
+        """ Compute the named Derived property for all rows """
+        prop = self._model._params[name]
+        if prop.vectorized:
+            loader = prop.loader
+            if loader is None:
+                loader = "_%s" % name
+            if isinstance(loader, str):
+                values = getattr(self._model, loader)(BatchColumns(self))
+            else:
+                values = loader()
+            return np.broadcast_to(values, (self._size,)).copy()
+
+        if self._size == 0:
+            return np.array([])
+        # Evaluate each row with a scratch Model instance
+        names = list(self._columns)
+        columns = [self._columns[n].tolist() for n in names]
+        values = []
+        for index in range(self._size):
+            if self._scratch is None:
+                self._scratch = self.row(index)
+            else:
+                for key, column in zip(names, columns):
+                    setattr(self._scratch, key, column[index])
+            values.append(getattr(self._scratch, name))
+        try:
+            return np.array(values, dtype=prop.dtype if prop.dtype is float else None)
+        except (TypeError, ValueError):
+            ret = np.empty(len(values), dtype=object)
+            ret[:] = values
+            return ret
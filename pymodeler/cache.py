@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+Caches for the values of Derived properties.
+
+The `LRUCache` keeps the values computed for the most recently used
+parameter points in memory, so that returning to an earlier point
+(e.g., after a rejected MCMC proposal) does not call the loader.
+
+The `DiskCache` keeps values in files, addressed by a hash of the
+model class, the loader and its inputs, so that they can be shared
+between jobs (and between processes on the same machine).
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+from collections import OrderedDict as odict
+
+import numpy as np
+
+
+def nbytes(value):
+    """Estimate the memory used by a value (in bytes)"""
+    try:
+        return int(value.nbytes)
+    except AttributeError:
+        return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Least-recently-used cache with a limit on the number of entries
+    and (optionally) on their total size in bytes.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries.
+    maxbytes : int or None
+        Maximum total size of the entries, if None there is no limit.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._data = odict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the value for key (counting a hit), or default
+        (counting a miss)"""
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Add a value, evicting the least recently used entries to
+        stay within the limits"""
+        size = nbytes(value)
+        if key in self._data:
+            self.nbytes -= self._data.pop(key)[1]
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        self._data[key] = (value, size)
+        self.nbytes += size
+        while len(self._data) > self.maxsize or \
+              (self.maxbytes is not None and self.nbytes > self.maxbytes):
+            _, (_, size) = self._data.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries (the counters are not reset)"""
+        self._data.clear()
+        self.nbytes = 0
+
+    def info(self):
+        """Return the counters as an '~collections.OrderedDict'"""
+        return odict([('hits', self.hits), ('misses', self.misses),
+                      ('evictions', self.evictions), ('size', len(self)),
+                      ('nbytes', self.nbytes)])
+
+
+class DiskCache:
+    """Persistent content-addressed cache in a directory.
+
+    Numpy arrays are stored as '.npy' files and returned memory-mapped
+    (read-only); other values are pickled. When the total size of the
+    files exceeds `maxbytes`, the least recently used files are removed.
+
+    Files are written to a temporary name and renamed into place, so
+    several processes can safely share one directory.
+
+    Parameters
+    ----------
+    path : str
+        The cache directory (created if needed).
+    maxbytes : int or None
+        Maximum total size of the files, if None there is no limit.
+    mmap : bool
+        Return numpy arrays memory-mapped rather than read into memory.
+    """
+
+    def __init__(self, path, maxbytes=None, mmap=True):
+        self.path = path
+        self.maxbytes = maxbytes
+        self.mmap = mmap
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """Return the key (a hex digest) for a set of picklable parts.
+
+        Raises TypeError if the parts can not be pickled.
+        """
+        try:
+            data = pickle.dumps(parts, protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            raise TypeError("Can not build a cache key") from err
+        return hashlib.sha256(data).hexdigest()
+
+    def _filename(self, key, ext):
+        return os.path.join(self.path, key[:2], key + ext)
+
+    def get(self, key, default=None):
+        """Return the value for key (counting a hit), or default
+        (counting a miss)"""
+        for ext in ('.npy', '.pkl'):
+            filename = self._filename(key, ext)
+            try:
+                if ext == '.npy':
+                    value = np.load(filename, mmap_mode='r' if self.mmap else None)
+                else:
+                    with open(filename, 'rb') as f:
+                        value = pickle.load(f)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                continue
+            try:
+                # Mark as recently used
+                os.utime(filename)
+            except OSError: #pragma: no cover
+                pass
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Store a value, then evict the least recently used files
+        to stay within the size limit"""
+        is_array = isinstance(value, np.ndarray) and value.dtype != object
+        filename = self._filename(key, '.npy' if is_array else '.pkl')
+        dirname = os.path.dirname(filename)
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if is_array:
+                    np.save(f, value)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpname, filename)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Values that can not be pickled are not cached
+            os.unlink(tmpname)
+            return
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+        if self.maxbytes is not None:
+            self.evict(self.maxbytes)
+
+    def _files(self):
+        """Return a list of (mtime, size, filename) for the cached files"""
+        files = []
+        for dirpath, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                if not filename.endswith(('.npy', '.pkl')):
+                    continue
+                filename = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(filename)
+                except OSError: #pragma: no cover
+                    # Removed by another process
+                    continue
+                files.append((stat.st_mtime, stat.st_size, filename))
+        return files
+
+    @property
+    def nbytes(self):
+        """Total size of the cached files"""
+        return sum(f[1] for f in self._files())
+
+    def evict(self, maxbytes):
+        """Remove the least recently used files until the total size
+        is at most maxbytes"""
+        files = sorted(self._files())
+        total = sum(f[1] for f in files)
+        for _, size, filename in files:
+            if total <= maxbytes:
+                break
+            try:
+                os.unlink(filename)
+                self.evictions += 1
+            except OSError: #pragma: no cover
+                # Removed by another process
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove all the cached files"""
+        self.evict(0)
+
+    def info(self):
+        """Return the counters as an '~collections.OrderedDict'"""
+        files = self._files()
+        return odict([('hits', self.hits), ('misses', self.misses),
+                      ('evictions', self.evictions), ('size', len(files)),
+                      ('nbytes', sum(f[1] for f in files))])
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Counters and timers for the hot paths of Model.
+
+Instrumentation is off by default. `enable()` wraps the instrumented
+methods of `pymodeler.model.Model` with timers, and `disable()`
+restores the original methods, so there is no overhead at all when
+it is off.
+
+Times are inclusive (e.g., the time of `set_attributes` includes the
+`setp` calls it makes) and are reported per Model class and, where it
+applies, per property name.
+
+Examples::
+
+    from pymodeler import instrument
+    instrument.enable()
+    ...
+    instrument.snapshot()   # Nested dictionary of calls and times
+    instrument.to_json()    # The same as a JSON string
+    instrument.reset()
+    instrument.disable()
+"""
+from __future__ import absolute_import, division, print_function
+
+import json
+import functools
+import threading
+from time import perf_counter
+from collections import OrderedDict as odict
+
+from pymodeler.model import Model
+
+# Instrumented methods: (attribute, reported name, called with a property name)
+METHODS = [
+    ('__init__', '__init__', False),
+    ('setp', 'setp', True),
+    ('_set_value', 'setattr', True),
+    ('set_attributes', 'set_attributes', False),
+    ('clear_derived', 'clear_derived', False),
+    ('_run_loader', 'loader', True),
+    ('todict', 'todict', False),
+    ('dump', 'dump', False),
+]
+
+# (class name, operation, property name) -> [calls, time]
+_counters = {}
+_lock = threading.Lock()
+# The original methods, while instrumentation is enabled
+_originals = {}
+
+
+def _record(key, elapsed):
+    with _lock:
+        counter = _counters.get(key)
+        if counter is None:
+            _counters[key] = [1, elapsed]
+        else:
+            counter[0] += 1
+            counter[1] += elapsed
+
+
+def _timed(func, operation, named):
+    """Wrap a method with a timer"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            name = args[0] if named and args else None
+            _record((type(self).__name__, operation, name), elapsed)
+    return wrapper
+
+
+def enabled():
+    """Is the instrumentation enabled?"""
+    return bool(_originals)
+
+
+def enable():
+    """Start counting and timing calls"""
+    if enabled():
+        return
+    for attr, operation, named in METHODS:
+        func = Model.__dict__[attr]
+        _originals[attr] = func
+        setattr(Model, attr, _timed(func, operation, named))
+
+
+def disable():
+    """Stop counting and timing calls (the counters are kept)"""
+    for attr, func in _originals.items():
+        setattr(Model, attr, func)
+    _originals.clear()
+
+
+def reset():
+    """Reset all the counters"""
+    with _lock:
+        _counters.clear()
+
+
+def snapshot():
+    """
+    Return a copy of the counters.
+
+    Returns
+    -------
+    stats : `~collections.OrderedDict`
+        Keyed by Model class name and then by operation, with the
+        number of 'calls' and total 'time' (in seconds). Operations
+        on named properties also contain the counters 'by_name'.
+    """
+    with _lock:
+        counters = sorted(_counters.items(), key=lambda x: (x[0][0], x[0][1], str(x[0][2])))
+    stats = odict()
+    for (clsname, operation, name), (calls, elapsed) in counters:
+        ops = stats.setdefault(clsname, odict())
+        op = ops.setdefault(operation, odict([('calls', 0), ('time', 0.)]))
+        op['calls'] += calls
+        op['time'] += elapsed
+        if name is not None:
+            by_name = op.setdefault('by_name', odict())
+            by_name[name] = odict([('calls', calls), ('time', elapsed)])
+    return stats
+
+
+def to_json(**kwargs):
+    """Return the counters as a JSON string (see `snapshot`)
+
+    Keyword arguments are passed to `json.dumps`.
+    """
+    return json.dumps(snapshot(), **kwargs)
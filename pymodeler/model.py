@@ -1,27 +1,303 @@
 #!/usr/bin/env python
 """
 A Model object is just a container for a set of Parameter.
-Implements __getattr__ and __setattr__.
+Attribute access to the parameters is implemented with a
+`PropertyAccessor` descriptor per parameter name (and per alias in
+Model._mapping), created when the Model sub-class is defined.
 
 The model has a set of default parameters stored in Model._params.
 Careful, if these are changed, they will be changed for all
-subsequent instances of the Model.
+subsequent instances of the Model, and for the existing instances
+that still share them (see below).
 
-The parameters for a given instance of a model are stored in the
-Model.params attribute. This attribute is a deepcopy of
-Model._params created during instantiation.
+The parameters for a given instance of a model are accessed through
+the Model.params attribute. Instances share the Property objects in
+Model._params (copy-on-write) and only make a private copy of a
+Property the first time it is written or handed out for modification
+(i.e., through `setp`, `getp` or `params[name]`). Until then, an
+instance reads the Property in Model._params, including any change
+made to it.
 
 """
 from __future__ import absolute_import, division, print_function
 
+import os
 import copy
+import time
+import asyncio
+import inspect
+import functools
+import threading
+import contextvars
 from collections import OrderedDict as odict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from collections.abc import Mapping
 
 import numpy as np
 import yaml
 
-from pymodeler.parameter import Derived, Parameter
+from pymodeler import snapshot
+from pymodeler.cache import LRUCache
+from pymodeler.parameter import Property, Derived, Parameter, FloatParameter
+from pymodeler.parameter import odict_representer
 
+# Use LibYAML if available
+try:
+    from yaml import CDumper as _Dumper, CSafeLoader as Loader
+except ImportError: #pragma: no cover
+    from yaml import Dumper as _Dumper, SafeLoader as Loader
+from pymodeler.storage import ParameterArray, ParameterView
+
+
+
+# Values that can safely be shared between instances
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes)
+
+
+# Book-keeping attributes set by `Model._init_properties` (the other
+# instance attributes are part of the state, see `Model._get_state`)
+_INTERNAL = frozenset(['_owned', '_missing', '_deps', '_rdeps', '_untracked',
+                       '_trace', '_invalidated', '_pending', '_memos',
+                       '_free_index', '_array', '_lock', '_loading',
+                       '_generation', '_tasks', '_scheduled', '_stale',
+                       '_snapshots'])
+
+# Methods that hold the lock of a thread-safe Model (see `_threadsafe`)
+_SYNCHRONIZED = ('setp', '_set_value', 'set_param_values', 'clear_derived',
+                 'batch_update')
+
+# Methods that `Model.from_records` does not call when it builds the
+# instances in bulk
+_BULK_SKIPPED = ('__init__', 'setp', '_set_value', 'set_attributes',
+                 '_cache_many')
+
+# Marks the fields that are absent from a record
+_MISSING = object()
+
+
+def _shallow_copy(value):
+    """ Copy lists (e.g., the bounds of a Parameter), share the rest """
+    return list(value) if type(value) is list else value
+
+
+def _record_columns(records):
+    """ Convert records to columns.
+
+    Parameters
+    ----------
+    records : iterable of dict, structured `~numpy.ndarray` or mapping of columns
+
+    Returns
+    -------
+    size : int
+        The number of records.
+    columns : '~collections.OrderedDict'
+        The values (as lists) keyed by field name. Fields that are
+        absent from a record are `_MISSING`.
+    """
+    def tolist(column):
+        return column.tolist() if isinstance(column, np.ndarray) else list(column)
+
+    if isinstance(records, np.ndarray):
+        if records.dtype.names is None:
+            raise TypeError("Records must be a structured array")
+        columns = odict((n, tolist(records[n])) for n in records.dtype.names)
+        return len(records), columns
+    if isinstance(records, Mapping):
+        columns = odict((k, tolist(v)) for k, v in records.items())
+        sizes = set(len(v) for v in columns.values())
+        if len(sizes) > 1:
+            raise ValueError("Columns of different lengths: %s" % sorted(sizes))
+        return (sizes.pop() if sizes else 0), columns
+    rows = list(records)
+    names = odict()
+    for row in rows:
+        names.update(odict.fromkeys(row))
+    columns = odict((n, [row.get(n, _MISSING) for row in rows]) for n in names)
+    return len(rows), columns
+
+
+class Dumper(_Dumper):
+    """ YAML dumper for Models, writing Properties as flow mappings
+    and numpy scalars, arrays and tuples as plain YAML (so that the
+    output can be read with a safe `Loader`).
+    """
+
+    def ignore_aliases(self, data):
+        return True
+
+Dumper.add_representer(odict, odict_representer)
+Dumper.add_multi_representer(Property, Property.representer)
+Dumper.add_multi_representer(np.generic, lambda d, x: d.represent_data(x.item()))
+Dumper.add_representer(np.ndarray, lambda d, x: d.represent_list(x.tolist()))
+Dumper.add_representer(tuple, lambda d, x: d.represent_list(x))
+
+
+# Sub-fields of each Parameter in `Model.record_dtype`
+_PARAM_RECORD = np.dtype([('value', 'f8'), ('errors', 'f8', (2,)),
+                          ('bounds', 'f8', (2,)), ('free', '?')])
+
+
+def _pair(pair):
+    """ Convert a pair of (possibly NaN) floats to a list or None """
+    low, high = pair
+    if low != low and high != high:
+        return None
+    return [low, high]
+
+
+def _map_chunk(model, name, rows):
+    """ Evaluate a property of a copy of model at each of a list of
+    parameter points (see `Model.map_derived`).
+
+    Each point starts from the state of model: the attributes set
+    by the previous point are set back in the same `update` (so that
+    the Derived values that do not depend on them are kept).
+
+    Returns a list of (value, exception) pairs, one per point.
+    """
+    base = model
+    model = copy.copy(base)
+    previous = {}
+    results = []
+    for row in rows:
+        reset = _reset_attributes(base, [k for k in previous if k not in row])
+        if reset is None:
+            model = copy.copy(base)
+            reset = {}
+        try:
+            model.update(**reset, **row)
+            previous = row
+            results.append((model._value(name), None))
+        except Exception as err: #pylint: disable=broad-except
+            results.append((None, err))
+    return results
+
+
+def _reset_attributes(base, names):
+    """ Return the attributes that set the named properties back to
+    their state in base (see `_map_chunk`), or None if some of them
+    are not properties.
+    """
+    reset = {}
+    for key in names:
+        setter = base._setters.get(key)
+        if setter is None:
+            return None
+        target, fields = setter
+        prop = base._peek(target)
+        if fields:
+            reset[key] = {k: _shallow_copy(v) for k, v in prop.todict().items()}
+        else:
+            reset[key] = prop.value
+    return reset
+
+
+def _synchronized(cls, name):
+    """ Wrap the named method of a thread-safe Model sub-class, which
+    changes the state of the instance.
+
+    The method holds the lock of the instance, and the generation of
+    the Derived values is advanced both before and after it runs, so
+    that the values computed from a partly changed state are not
+    stored (see `Model._load_once`).
+
+    A method inherited from a base class is looked up when it is
+    called, so that the wrapper follows later changes of the base
+    class (e.g., by `pymodeler.instrument`).
+    """
+    own = cls.__dict__.get(name)
+
+    def bound(self):
+        if own is not None:
+            return own.__get__(self, cls)
+        return getattr(super(cls, self), name)
+
+    if name == 'batch_update':
+        @functools.wraps(getattr(cls, name))
+        @contextmanager
+        def wrapper(self):
+            with self._lock:
+                self._generation += 1
+                try:
+                    with bound(self)() as model:
+                        yield model
+                finally:
+                    self._generation += 1
+    else:
+        @functools.wraps(getattr(cls, name))
+        def wrapper(self, *args, **kwargs):
+            with self._lock:
+                self._generation += 1
+                try:
+                    return bound(self)(*args, **kwargs)
+                finally:
+                    self._generation += 1
+    wrapper.synchronized = True
+    return wrapper
+
+
+class _ContextTrace:
+    """ Stack of the names read by the loaders being run, with one
+    stack per thread and per asyncio task (used as `Model._trace` by
+    thread-safe models and by models with async loaders)
+    """
+    __slots__ = ('stack',)
+
+    def __init__(self):
+        # The stack is a tuple, so that the tasks started by a loader
+        # do not share it
+        self.stack = contextvars.ContextVar('trace', default=())
+
+    def __bool__(self):
+        return bool(self.stack.get())
+
+    def __getitem__(self, index):
+        return self.stack.get()[index]
+
+    def append(self, names):
+        self.stack.set(self.stack.get() + (names,))
+
+    def pop(self):
+        stack = self.stack.get()
+        self.stack.set(stack[:-1])
+        return stack[-1]
+
+
+class _Flight:
+    """ A Derived value being computed by one thread, for the given
+    generation of the Model state (see `Model._load_once`)
+    """
+    __slots__ = ('generation', 'done')
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+
+
+class _Scheduled:
+    """ The update of the cache of a Model waiting to run in the
+    background (see `Model._background_cache`)
+    """
+    __slots__ = ('names', 'derived', 'running', 'due', 'timer', 'idle',
+                 'error')
+
+    def __init__(self):
+        # Parameters changed and Derived values cleared since the
+        # last update
+        self.names = set()
+        self.derived = set()
+        # Derived values computed by the update in progress
+        self.running = set()
+        self.due = 0.
+        self.timer = None
+        # Set when no update is waiting or running
+        self.idle = threading.Event()
+        self.idle.set()
+        # Raised by the cache hook, until it is raised again in the
+        # main thread
+        self.error = None
 
 
 def _indent(string, width=0): #pragma: no cover
@@ -30,6 +306,117 @@ def _indent(string, width=0): #pragma: no cover
     return '{0:>{1}}{2}'.format('', width, string)
 
 
+def _shareable(value):
+    """ Check if a value is immutable and can be shared between instances
+    """
+    return type(value) in _IMMUTABLE or isinstance(value, np.generic)
+
+
+class PropertyAccessor:
+    """Data descriptor giving attribute access to the value of a
+    Property of a `Model` instance.
+
+    One accessor is created per parameter name and per alias in
+    `_mapping` when the `Model` sub-class is defined.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._trace:
+            obj._trace[-1].add(self.name)
+        prop = obj._owned.get(self.name)
+        if prop is None:
+            return obj._value(self.name)
+        return prop.value
+
+    def __set__(self, obj, value):
+        obj._set_value(self.name, value)
+
+
+class ArrayAccessor(PropertyAccessor):
+    """Data descriptor giving attribute access to the value of a
+    Parameter stored in the `ParameterArray` of a `Model` instance.
+    """
+    __slots__ = ('index',)
+
+    def __init__(self, name, index):
+        super(ArrayAccessor, self).__init__(name)
+        self.index = index
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._trace:
+            obj._trace[-1].add(self.name)
+        value = obj._array.values.item(self.index)
+        return None if value != value else value
+
+
+class DerivedAccessor(PropertyAccessor):
+    """Data descriptor giving attribute access to the value of a
+    Derived property of a `Model` instance.
+    """
+    __slots__ = ()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._derived_value(self.name)
+
+
+class InstanceAttribute:
+    """Data descriptor for a plain instance attribute.
+
+    Used to hide a `PropertyAccessor` inherited from a parent
+    `Model` when the sub-class no longer defines that parameter.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError as msg:
+            raise AttributeError(self.name) from msg
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+class ParamsView(Mapping):
+    """Read-only mapping from parameter names to the `Property` objects
+    of a `Model` instance.
+
+    Looking up a `Property` through this view gives the private
+    (copy-on-write) copy owned by the model, so it is safe to modify.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    def __getitem__(self, name):
+        self._model._traced((name,))
+        return self._model._own(name)
+
+    def __iter__(self):
+        return iter(self._model._params)
+
+    def __len__(self):
+        return len(self._model._params)
+
+    def __contains__(self, name):
+        return name in self._model._params
+
+
 class Model:
     """A base class to manage Parameters and Properties
 
@@ -101,16 +488,95 @@ class Model:
         Set all the Properties using a dictionary or mapping
         m.set_attributes(``**kwargs``)
 
+        Build many instances from a list of dictionaries, a numpy
+        structured array or a dictionary of columns:
+        models = ModelExample.from_records(records)
+        models = ModelExample.from_records(records, processes=8)
+
+        Set several Properties, clearing the Derived properties and
+        calling _cache only once (and rolling back on errors):
+        m.update(``**kwargs``)
+        with m.batch_update():
+            m.fuel_rate = 8.
+            m.distance = 12.
+
         Clear all of the Derived properties (to force recomputation)
         m.clear_derived()
 
+        Compute all of the Derived properties, running independent
+        loaders at the same time in a pool of threads:
+        m.materialize()
+
+        Derived properties can have async loaders (e.g., for I/O),
+        which are awaited inside an event loop:
+        async def _fuel_needed(self): ...
+        value = await m.aget('fuel_needed')
+        await m.amaterialize()
+
+        Inspect the dependencies of the Derived properties:
+        m.dependencies()            # Declared or traced dependencies
+        m.dependents('distance')    # Derived properties downstream of 'distance'
+        m.last_invalidated          # Derived values cleared by the last change
+
+        The Derived values are only cleared when the properties read
+        by their loaders change, unless the class overrides _cache or
+        _cache_many (the loaders may read what they compute); a class
+        can choose either way:
+        _trace_dependencies = False
+
+        Keep the values of a Derived property for the last 100
+        parameter points (with at most 1 MB of values):
+        ('fuel_needed', Derived(units="l", memo=100, memo_bytes=2**20))
+        m.memo_info()               # Hits, misses and evictions
+
+        Update the value of a Derived property from its previous value
+        when some parameters change (or return NotImplemented to call
+        the loader):
+        def _fuel_needed_update(self, old, changes):
+            if list(changes) != ['fuel_rate']:
+                return NotImplemented
+            old_rate, new_rate = changes['fuel_rate']
+            return old * old_rate / new_rate
+
+        Store the values of a Derived property in a directory shared
+        between jobs (limited to 10 GB):
+        ('fuel_needed', Derived(units="l", disk_cache=True, version=1))
+        ModelExample._disk_cache = pymodeler.cache.DiskCache('/path/to/cache', maxbytes=10e9)
+
         Output:
 
         Convert to an ~collections.OrderedDict
         m.todict()
 
-        Convert to a yaml string:
+        Convert to a yaml string (and back):
         m.dump()
+        m = ModelExample.from_yaml(m.dump())
+
+        Write and read many models as a stream of yaml documents:
+        with open('models.yaml', 'w') as f:
+            ModelExample.dump_all(models, f)
+        for m in ModelExample.load_all('models.yaml'):
+            ...
+
+        Instances can be pickled (e.g., sent to a process pool) and
+        copied. Only the state is included, not the bound loaders, and
+        the Derived values are left out if the class sets:
+        _pickle_derived = False
+
+        Evaluate a Derived property at many parameter points, in a
+        pool of processes:
+        with concurrent.futures.ProcessPoolExecutor() as pool:
+            m.map_derived('fuel_needed', dict(distance=distances), executor=pool)
+
+        Save a binary snapshot, including the values of the Derived
+        properties (large arrays are memory-mapped when restored):
+        m.save_snapshot('model.snap')
+        m = ModelExample.load_snapshot('model.snap')
+
+        Convert the Parameters to a structured numpy record (and back):
+        ModelExample.record_dtype()
+        record = m.to_record()
+        m = ModelExample.from_record(record)
 
         Access the values of all the Parameter objects:
         m.param_values()            # Get all the parameter values
@@ -120,6 +586,34 @@ class Model:
         m.param_errors()            # Get all the parameter values
         m.param_errors(paramNames)  # Get a subset of the parameter values, by name
 
+        Set the values of all the Parameter objects at once:
+        m.set_param_values(values)
+        m.set_param_values(values, paramNames)
+
+        Access the free Parameter objects as a vector (e.g., for an optimizer):
+        m.free_names()
+        m.free_values()
+        m.free_bounds()
+        m.set_free_values(values)
+
+        Store the Parameter values, bounds, errors and free status in
+        contiguous arrays (for fast `param_values` and `set_param_values`):
+        class ArrayModelExample(ModelExample):
+            _array_storage = True
+
+        Share an instance between threads: the changes of the
+        parameters are atomic, and threads reading a Derived property
+        that is not computed yet wait for a single call of the loader:
+        class SharedModelExample(ModelExample):
+            _threadsafe = True
+
+        Update the cache (call _cache and compute again the Derived
+        values that were cleared) in a background thread, 50 ms after
+        the last change of the parameters:
+        class InteractiveModelExample(ModelExample):
+            _background_cache = 0.05
+        m.wait_cache()
+
     """
 
     # `_params` is a tuple of Property objects
@@ -129,11 +623,159 @@ class Model:
     # for the parameters in _params
     _mapping = odict([])
 
+    # Class-level book-keeping (filled by `_compile`)
+    # Names of the required and Derived properties
+    _required = ()
+    _derived = ()
+    # Declared dependencies of the Derived properties and their inverse
+    _depends = {}
+    _rdepends = {}
+    # Clear a Derived value only when the properties read by its
+    # loader change (see `_record_deps`): True, False, or None to do
+    # so unless the class overrides `_cache` or `_cache_many`, whose
+    # results the loaders may read
+    _trace_dependencies = None
+    # The resolved setting (filled by `_compile`)
+    _tracing = True
+    # How `set_attributes` sets each name (see `_compile`)
+    _setters = {}
+    # The `_params` and `_mapping` that were compiled (see `_signature`)
+    _compiled = None
+    # Structured dtype of the records (see `record_dtype`)
+    _record_dtype = None
+
+    # Store the Parameter values, bounds, errors and free status
+    # in contiguous arrays (see `pymodeler.storage`)
+    _array_storage = False
+    _array_template = None
+
+    # `pymodeler.cache.DiskCache` for the Derived properties
+    # flagged with 'disk_cache'
+    _disk_cache = None
+
+    # Include the cached Derived values when pickling or copying
+    _pickle_derived = True
+
+    # Allow the instances to be shared between threads (see `_load_once`)
+    _threadsafe = False
+    # Delay (in seconds) after the last change before the cache is
+    # updated in a background thread, or None to update it in `setp`
+    # (see `_schedule_cache`); this makes the model thread-safe
+    _background_cache = None
+    # Derived properties with async loaders (filled by `_compile`)
+    _coroutines = frozenset()
+    # Updaters of the Derived properties (see `_update_stale`)
+    _updaters = {}
+    # Advanced by every change of the state of a thread-safe instance
+    _generation = 0
+    # Lock of the instance (a re-entrant lock if `_threadsafe`)
+    _lock = nullcontext()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile()
+
+    @classmethod
+    def _compile(cls):
+        """ Build the class-level book-keeping derived from `_params`.
+
+        This is called when a sub-class is created, and again when an
+        instance is built after properties were added to (or removed
+        from) `_params` or `_mapping`.
+        """
+        cls._compiled = cls._signature()
+        cls._required = tuple(k for k, p in cls._params.items() if p.required)
+        cls._derived = tuple(k for k, p in cls._params.items()
+                             if isinstance(p, Derived))
+        coroutines = []
+        for name in cls._derived:
+            loader = cls._params[name].loader
+            if loader is None:
+                loader = "_%s" % name
+            if isinstance(loader, str):
+                loader = getattr(cls, loader, None)
+            if inspect.iscoroutinefunction(loader):
+                coroutines.append(name)
+        cls._coroutines = frozenset(coroutines)
+        cls._updaters = {}
+        for name in cls._derived:
+            updater = cls._params[name].updater
+            if updater is None:
+                updater = "_%s_update" % name
+                if not hasattr(cls, updater):
+                    continue
+            cls._updaters[name] = updater
+
+        cls._depends = {}
+        cls._rdepends = {}
+        for name in cls._derived:
+            depends = cls._params[name].depends
+            if depends is None:
+                continue
+            depends = tuple(cls._mapping.get(d, d) for d in depends)
+            cls._depends[name] = depends
+            for dep in depends:
+                cls._rdepends.setdefault(dep, set()).add(name)
+
+        cls._tracing = cls._trace_dependencies
+        if cls._tracing is None:
+            cls._tracing = (cls._cache is Model._cache and
+                            cls._cache_many is Model._cache_many)
+
+        if cls._background_cache is not None:
+            cls._threadsafe = True
+
+        if cls._array_storage:
+            cls._array_template = ParameterArray.from_params(cls._params)
+        else:
+            cls._array_template = None
+        # Built on demand
+        cls._record_dtype = None
+
+        # Attribute access to the parameters, including the aliases
+        names = list(cls._params) + list(cls._mapping)
+
+        # For set_attributes: the name of the property and whether a
+        # mapping gives the fields (value, bounds, etc.) to set
+        cls._setters = {}
+        for name in names:
+            target = cls._mapping.get(name, name)
+            if target in cls._params:
+                fields = isinstance(cls._params[target], Parameter)
+                cls._setters[name] = (target, fields)
+        for name in names:
+            existing = getattr(cls, name, None)
+            if existing is not None and not isinstance(existing, PropertyAccessor):
+                # Don't hide methods or other class attributes
+                continue
+            target = cls._mapping.get(name, name)
+            if target in cls._derived:
+                setattr(cls, name, DerivedAccessor(target))
+            elif cls._array_storage and target in cls._array_template.index:
+                index = cls._array_template.index[target]
+                setattr(cls, name, ArrayAccessor(target, index))
+            else:
+                setattr(cls, name, PropertyAccessor(target))
+        for name in dir(cls):
+            if name not in names and isinstance(getattr(cls, name), PropertyAccessor):
+                setattr(cls, name, InstanceAttribute(name))
+
+        if cls._threadsafe:
+            for name in _SYNCHRONIZED:
+                method = getattr(cls, name)
+                if not getattr(method, 'synchronized', False):
+                    setattr(cls, name, _synchronized(cls, name))
+
+    @classmethod
+    def _signature(cls):
+        """ Identify the `_params` and `_mapping` of the class, to
+        detect the changes made after `_compile`.
+        """
+        return (id(cls._params), len(cls._params), id(cls._mapping), len(cls._mapping))
+
     def __init__(self, **kwargs):
         """ C'tor.  Build from a set of keyword arguments.
         """
-
-        self.params = self.defaults
         self._init_properties()
         self.set_attributes(**kwargs)
         # In case no properties were set, cache anyway
@@ -141,10 +783,13 @@ class Model:
 
     def __getattr__(self, name):
         """ Access operator, i.e., x = m.name
+
+        Parameters defined with the class are accessed through a
+        `PropertyAccessor`; this only handles the other names.
         """
-        # Return 'getp' of parameter
+        # Return the value of the parameter
         if name in self._params or name in self._mapping:
-            return self.getp(name).value
+            return self._value(self._mapping.get(name, name))
 
         # Raises AttributeError
         try:
@@ -152,15 +797,6 @@ class Model:
         except KeyError as msg:
             raise AttributeError from msg
 
-    def __setattr__(self, name, value):
-        """ Assignement operator, i.e., m.name = x
-        """
-        # Call 'setp' on parameters
-        if name in self._params or name in self._mapping:
-            self.setp(name, value=value)
-        else:
-            self.__dict__[name] = value
-
     def __str__(self, indent=0):
         """ Cast model as a formatted string
         """
@@ -168,16 +804,22 @@ class Model:
             ret = '{0:>{2}}{1}'.format('', self.name, indent)
         except AttributeError:
             ret = "%s" % (type(self))
-        if not self.params: #pragma: no cover
+        if not self._params: #pragma: no cover
             pass
         else:
             ret += '\n{0:>{2}}{1}'.format('', 'Parameters:', indent + 2)
-            width = len(max(self.params.keys(), key=len))
-            for name, value in self.params.items():
+            width = len(max(self._params.keys(), key=len))
+            for name in self._params:
+                value = self._peek(name)
                 par = '{0!s:{width}} : {1!r}'.format(name, value, width=width)
                 ret += '\n{0:>{2}}{1}'.format('', par, indent + 4)
         return ret
 
+    @property
+    def params(self):
+        """Mapping of the parameters of this instance."""
+        return ParamsView(self)
+
     @property
     def defaults(self):
         """Ordered dictionary of default parameters."""
@@ -212,7 +854,9 @@ class Model:
 
         """
         name = self._mapping.get(name, name)
-        return self.params[name]
+        if self._trace:
+            self._trace[-1].add(name)
+        return self._own(name)
 
     def setp(self, name, **kwargs):
         """
@@ -226,7 +870,7 @@ class Model:
         Keywords
         --------
         clear_derived : bool
-            Flag to clear derived objects in this model
+            Flag to clear the derived objects that depend on this parameter
         value:
             The value of the parameter, if None, it is not changed
         bounds: tuple or None
@@ -241,40 +885,286 @@ class Model:
         kwcopy = kwargs.copy()
         clear_derived = kwcopy.pop('clear_derived', True)
         try:
-            self.params[name].set(**kwcopy)
+            self._writable(name).set(**kwcopy)
         except TypeError as msg:
             raise TypeError("Failed to set parameter %s" % name) from msg
 
+        self._commit((name,), clear_derived)
+
+    def _set_value(self, name, value):
+        """ Set the value of the named Property, i.e., m.name = x
+
+        This is equivalent to `setp(name, value=value)`.
+        """
+        prop = self._owned.get(name)
+        if prop is None or self._pending is not None:
+            prop = self._writable(name)
+        try:
+            prop.set_value(value)
+        except TypeError as msg:
+            raise TypeError("Failed to set parameter %s" % name) from msg
+
+        self._commit((name,))
+
+    def _writable(self, name):
+        """ Return the named Property to be modified.
+
+        During a `batch_update` the Property is copied the first time
+        it is written, so that the previous state can be restored.
+        """
+        pending = self._pending
+        if pending is None or name in pending:
+            return self._own(name)
+        prop = self._owned.get(name)
+        pending[name] = prop
+        if prop is not None and not isinstance(prop, ParameterView):
+            # Property.set replaces (rather than modifies) the state
+            self._owned[name] = copy.copy(prop)
+        return self._own(name)
+
+    def _commit(self, names, clear_derived=True):
+        """ Clear the Derived properties that depend on the changed
+        parameters and call the cache hook.
+
+        During a `batch_update` this is deferred to the end of the batch.
+        """
+        if self._pending is not None:
+            return
         if clear_derived:
-            self.clear_derived()
-        self._cache(name)
+            self._invalidate(names)
+        if self._background_cache is None:
+            self._cache_many(names)
+        else:
+            self._schedule_cache(names)
+
+    @contextmanager
+    def batch_update(self):
+        """ Context manager to update several parameters at once.
+
+        Values are checked when they are set, but clearing the
+        Derived properties and calling the cache hook is deferred
+        until the end of the block, when it is done once for all the
+        changed parameters. If an exception is raised inside the
+        block, all the parameters are restored to their state from
+        before the block.
+
+        Note that Derived properties read inside the block may not
+        reflect the changes made inside the block.
+
+        Examples::
+
+            with m.batch_update():
+                m.distance = 12.
+                m.setp('fuel_rate', value=7.)
+        """
+        if self._pending is not None:
+            # Join the enclosing batch
+            yield self
+            return
+
+        self._pending = odict()
+        saved_array = self._array.copy() if self._array_storage else None
+        try:
+            yield self
+        except BaseException:
+            pending, self._pending = self._pending, None
+            for name, prop in pending.items():
+                if prop is None:
+                    self._owned.pop(name, None)
+                else:
+                    self._owned[name] = prop
+            if saved_array is not None:
+                self._array.values[:] = saved_array.values
+                self._array.bounds[:] = saved_array.bounds
+                self._array.errors[:] = saved_array.errors
+                self._array.free[:] = saved_array.free
+            # Drop anything computed from the rolled-back values
+            self._invalidate(tuple(pending))
+            raise
+
+        pending, self._pending = self._pending, None
+        if pending:
+            self._commit(tuple(pending))
+
+    @classmethod
+    def from_records(cls, records, processes=None, chunksize=10000):
+        """
+        Build one instance per record.
+
+        This is equivalent to ``[cls(**row) for row in records]``,
+        but the columns of Parameter values are validated in bulk
+        before any instance is built, and the instances are filled in
+        directly rather than through `set_attributes`.
+
+        Parameters
+        ----------
+        records : iterable of dict, structured `~numpy.ndarray` or mapping of columns
+            The keyword arguments of the constructor for each instance.
+        processes : int or None
+            Build the instances in a pool of this many processes (the
+            Model class must be importable by the worker processes).
+        chunksize : int
+            Number of records per task of the process pool.
+
+        Returns
+        -------
+        models : list
+            The Model instances.
+
+        Raises TypeError, ValueError or KeyError (as the constructor),
+        with the index of the first invalid record in the message.
+        """
+        size, columns = _record_columns(records)
+        if processes is None or size <= chunksize:
+            return cls._build_records(columns, size, 0)
+
+        starts = list(range(0, size, chunksize))
+        chunks = [odict((k, v[start:start + chunksize]) for k, v in columns.items())
+                  for start in starts]
+        sizes = [min(chunksize, size - start) for start in starts]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = pool.map(cls._build_records, chunks, sizes, starts)
+            return [model for models in results for model in models]
+
+    @classmethod
+    def _check_column(cls, name, column, start):
+        """ Validate a column of values of the named Parameter.
+
+        Returns the values to store, or None if the column can not be
+        validated in bulk (i.e., not all the values are plain numbers).
+        """
+        proto = cls._params[name]
+        if type(proto) not in (Parameter, FloatParameter):
+            return None
+        vtypes = set(map(type, column))
+        if not vtypes <= {bool, int, float}:
+            return None
+        # The type check only depends on the type of the value
+        for vtype in vtypes:
+            row = next(i for i, v in enumerate(column) if type(v) is vtype)
+            try:
+                proto.check_type(column[row])
+            except TypeError as err:
+                msg = "Record %i: Failed to set parameter %s" % (start + row, name)
+                raise TypeError(msg) from err
+        values = np.array(column, dtype=float)
+        bounds = proto.bounds
+        if bounds is not None:
+            outside = ~((bounds[0] <= values) & (values <= bounds[1]))
+            if outside.any():
+                row = np.flatnonzero(outside)[0]
+                msg = "Record %i: Value of %s outside bounds: %.2g [%.2g,%.2g]"
+                msg = msg % (start + row, name, values[row], bounds[0], bounds[1])
+                raise ValueError(msg)
+        if isinstance(proto, FloatParameter):
+            return values.tolist()
+        return column
+
+    @classmethod
+    def _build_records(cls, columns, size, start):
+        """ Build the instances for a set of columns of records (see
+        `from_records`); start is the index of the first record.
+        """
+        def kwargs(i):
+            return odict((k, v[i]) for k, v in slow.items() if v[i] is not _MISSING)
+
+        if any(inspect.unwrap(getattr(cls, n)) is not inspect.unwrap(Model.__dict__[n])
+               for n in _BULK_SKIPPED):
+            # Sub-classes that change how the attributes are set are
+            # built one by one
+            slow = columns
+            models = []
+            for i in range(size):
+                try:
+                    models.append(cls(**kwargs(i)))
+                except (TypeError, ValueError, KeyError) as err:
+                    raise type(err)("Record %i: %s" % (start + i, err)) from err
+            return models
+
+        # Columns of Parameter values are validated in bulk, the others
+        # are set through set_attributes
+        fast = odict()
+        slow = odict()
+        for name, column in columns.items():
+            target, fields = cls._setters.get(name, (None, False))
+            if fields and target not in fast and \
+               not any(v is _MISSING for v in column):
+                values = cls._check_column(target, column, start)
+                if values is not None:
+                    fast[target] = values
+                    continue
+            slow[name] = column
+
+        if cls._array_storage and fast:
+            index = [cls._array_template.index[n] for n in fast]
+            matrix = np.column_stack(list(fast.values()))
+            protos = []
+        else:
+            index = matrix = None
+            protos = [(n, cls._params[n], v) for n, v in fast.items()]
+
+        models = []
+        for i in range(size):
+            model = cls.__new__(cls)
+            model._init_properties()
+            if matrix is not None:
+                model._array.values[index] = matrix[i]
+            for name, proto, values in protos:
+                prop = proto._copy(_shallow_copy)
+                prop.__value__ = values[i]
+                model._owned[name] = prop
+            for name in fast:
+                model._missing.pop(name, None)
+            try:
+                if slow:
+                    model.set_attributes(**kwargs(i))
+                elif model._missing:
+                    raise ValueError("One or more required properties are missing ",
+                                     model._missing.keys())
+            except (TypeError, ValueError, KeyError) as err:
+                raise type(err)("Record %i: %s" % (start + i, err)) from err
+            model._cache()
+            models.append(model)
+        return models
+
+    def update(self, **kwargs):
+        """ Set a group of attributes in a single `batch_update`.
+
+        Takes the same arguments as `set_attributes`.
+        """
+        with self.batch_update():
+            self.set_attributes(**kwargs)
 
     def set_attributes(self, **kwargs):
         """
         Set a group of attributes (parameters and members).  Calls
         `setp` directly, so kwargs can include more than just the
         parameter value (e.g., bounds, free, etc.).
+
+        The attributes are set in a single `batch_update`.
+        """
+        with self.batch_update():
+            self._set_attributes(**kwargs)
+
+    def _set_attributes(self, **kwargs):
+        """ Set a group of attributes (see `set_attributes`)
         """
-        self.clear_derived()
-        kwargs = dict(kwargs)
         for name, value in kwargs.items():
-            # Raise AttributeError if param not found
-            try:
-                self.getp(name)
-            except KeyError:
-                print ("Warning: %s does not have attribute %s" %
-                       (type(self), name))
-            # Set attributes
-            try:
-                self.setp(name, clear_derived=False, value=value)
-            except (TypeError, KeyError):
+            setter = self._setters.get(name)
+            if setter is None:
+                self._set_unknown(name, value)
+                continue
+            target, fields = setter
+            if not isinstance(value, Mapping):
+                self._set_value(target, value)
+            elif fields:
+                self.setp(target, **value)
+            else:
+                # The value of a Property may itself be a mapping
                 try:
-                    self.setp(name, clear_derived=False, **value)
+                    self._set_value(target, value)
                 except TypeError:
-                    try:
-                        self.setp(name, clear_derived=False, *value)
-                    except (TypeError, KeyError):
-                        self.__setattr__(name, value)
+                    self.setp(target, **value)
             # pop this attribued off the list of missing properties
             self._missing.pop(name, None)
         # Check to make sure we got all the required properties
@@ -283,21 +1173,875 @@ class Model:
                 "One or more required properties are missing ",
                 self._missing.keys())
 
+    def _set_unknown(self, name, value):
+        """ Set an attribute that is not a property (see `set_attributes`)
+        """
+        if name in self._params or name in self._mapping:
+            # Added to the class after this instance was built
+            type(self)._compile()
+            self._set_attributes(**{name: value})
+            return
+        print ("Warning: %s does not have attribute %s" %
+               (type(self), name))
+        if isinstance(value, Mapping):
+            # Raises KeyError
+            self.setp(name, **value)
+        setattr(self, name, value)
+
+    def __getstate__(self):
+        """ Return the state for pickling and copying (see `_get_state`)
+
+        The loaders of the Derived properties are bound again when the
+        state is restored, and the cached Derived values are only
+        included if `_pickle_derived` is True.
+        """
+        return self._get_state(self._pickle_derived)
+
+    def __setstate__(self, state):
+        self._set_state(state)
+
+    def map_derived(self, name, points, executor=None, chunksize=None, errors='raise'):
+        """
+        Evaluate a (Derived) property at many parameter points.
+
+        Each point is applied to a copy of this instance with
+        `update`, so this instance is not changed. The points are
+        split into chunks, which are evaluated in the executor (e.g.,
+        a `~concurrent.futures.ProcessPoolExecutor`); each task
+        receives the state of this instance without its Derived values.
+
+        Parameters
+        ----------
+        name : str
+            The property name.
+        points : iterable of dict, structured `~numpy.ndarray` or mapping of columns
+            The attributes to set for each point (as for `update`).
+        executor : `~concurrent.futures.Executor` or None
+            Where to evaluate the chunks; if None, they are evaluated
+            in this process.
+        chunksize : int or None
+            Number of points per task; by default, the points are split
+            into about 4 tasks per CPU.
+        errors : str
+            If 'raise', raise the exception of the first point that
+            failed (with the index of the point in the message). If
+            'return', return the exception in place of the value.
+
+        Returns
+        -------
+        values : `~numpy.ndarray` or list
+            The values, in the order of the points. A list is returned
+            if the values are not numeric (or exceptions are returned).
+        """
+        if errors not in ('raise', 'return'):
+            raise ValueError("errors must be 'raise' or 'return': %s" % errors)
+        name = self._mapping.get(name, name)
+        if name not in self._params:
+            raise KeyError(name)
+
+        size, columns = _record_columns(points)
+        rows = [{k: v[i] for k, v in columns.items() if v[i] is not _MISSING}
+                for i in range(size)]
+        if chunksize is None:
+            chunksize = max(1, -(-size // (4 * (os.cpu_count() or 1))))
+        chunks = [rows[i:i + chunksize] for i in range(0, size, chunksize)]
+
+        base = self.__class__.__new__(self.__class__)
+        base._set_state(self._get_state(derived=False))
+        if executor is None:
+            results = [_map_chunk(base, name, chunk) for chunk in chunks]
+        else:
+            futures = [executor.submit(_map_chunk, base, name, chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+
+        values = []
+        for index, (value, err) in enumerate(r for chunk in results for r in chunk):
+            if err is not None:
+                if errors == 'raise':
+                    raise type(err)("Point %i: %s" % (index, err)) from err
+                value = err
+            values.append(value)
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            # Values of different shapes
+            return values
+        if array.dtype.kind not in 'biufc':
+            return values
+        return array
+
+    def materialize(self, names=None, executor=None):
+        """
+        Compute the Derived properties that are not cached, running
+        the loaders of independent properties at the same time in a
+        pool of threads.
+
+        The properties are computed level by level: the properties
+        that a loader is known to depend on (declared or traced) are
+        computed at an earlier level. Properties with unknown
+        dependencies are computed at the first level; if one of them
+        reads another Derived property, it waits for that value to be
+        computed once (see `_load_once`).
+
+        This is useful when the loaders release the GIL (e.g., numpy
+        operations or I/O).
+
+        Parameters
+        ----------
+        names : list of str or None
+            The properties to compute, together with the Derived
+            properties they depend on; if None, all the Derived properties.
+        executor : `~concurrent.futures.ThreadPoolExecutor` or None
+            Where to run the loaders; if None, a pool is created for
+            the call.
+        """
+        levels = self._missing_levels(names)
+        if not levels:
+            return
+        with self._concurrent():
+            if executor is None and max(len(level) for level in levels) > 1:
+                with ThreadPoolExecutor() as pool:
+                    self._materialize_levels(levels, pool)
+            else:
+                self._materialize_levels(levels, executor)
+
+    def _materialize_levels(self, levels, executor):
+        """ Compute the Derived properties, level by level (see `materialize`)
+        """
+        for level in levels:
+            if executor is None or len(level) == 1:
+                for name in level:
+                    self._derived_value(name)
+            else:
+                # Raises the exception of the first loader that failed
+                list(executor.map(self._derived_value, level))
+
+    async def aget(self, name):
+        """
+        Return the value of the named property, awaiting the loader
+        if it is a coroutine function (``async def``).
+
+        The async loader of a Derived property runs in a task, and
+        concurrent awaits of the same property wait for that task. If
+        a property that the loader has already read is changed while
+        it runs, the task is cancelled and the loader started again.
+        Other loaders are run directly.
+
+        Parameters
+        ----------
+        name : str
+            The property name.
+
+        Returns
+        -------
+        value :
+            The value of the property.
+        """
+        name = self._mapping.get(name, name)
+        if name not in self._coroutines:
+            return self._value(name)
+        if self._trace:
+            self._trace[-1].add(name)
+        prop = self._owned.get(name)
+        if prop is None:
+            prop = self._own(name)
+        while True:
+            value = prop.__value__
+            if value is not None:
+                return value
+            flight = self._tasks.get(name)
+            if flight is None:
+                reads = set()
+                task = asyncio.get_running_loop().create_task(self._arun(name, prop, reads))
+                flight = self._tasks[name] = (task, reads)
+            task = flight[0]
+            try:
+                # One awaiting caller being cancelled does not cancel the task
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                # Cancelled by a change of the parameters
+
+    async def amaterialize(self, names=None):
+        """
+        Compute the Derived properties that are not cached, awaiting
+        the async loaders of independent properties concurrently
+        (with `asyncio.gather`), level by level (see `materialize`).
+
+        Parameters
+        ----------
+        names : list of str or None
+            The properties to compute, together with the Derived
+            properties they depend on; if None, all the Derived properties.
+        """
+        for level in self._missing_levels(names):
+            await asyncio.gather(*[self.aget(n) for n in level])
+
+    async def _arun(self, name, prop, reads):
+        """ Run the async loader of a Derived property (see `aget`),
+        recording the names that it reads.
+        """
+        try:
+            value, keys = self._lookup(name, prop)
+            if value is not None:
+                prop.set_value(value)
+            elif name in self._updaters and name in self._stale:
+                value = self._update_stale(name)
+                if value is not None:
+                    prop.set_loaded(value)
+                    self._store(name, prop, value, keys)
+            if value is None:
+                self._trace.append(reads)
+                try:
+                    value = await prop.loader()
+                finally:
+                    self._trace.pop()
+                prop.set_loaded(value)
+                self._record_deps(name, reads)
+                self._store(name, prop, value, keys)
+            if name in self._updaters:
+                self._snapshot(name, self._generation)
+            return value
+        finally:
+            flight = self._tasks.get(name)
+            if flight is not None and flight[0] is asyncio.current_task():
+                del self._tasks[name]
+
+    def _cancel_tasks(self, names=None):
+        """ Cancel the tasks running async loaders that have read any
+        of the named properties (all the tasks if names is None).
+        """
+        for name, (task, reads) in list(self._tasks.items()):
+            if names is None or not reads.isdisjoint(names):
+                task.cancel()
+                del self._tasks[name]
+
+    def _missing_levels(self, names=None):
+        """ Return the levels of the Derived properties to compute
+        (see `materialize`), without the properties that are cached.
+        """
+        if names is None:
+            names = self._derived
+        names = [self._mapping.get(n, n) for n in names]
+        for name in names:
+            if name not in self._derived:
+                raise KeyError(name)
+
+        levels = [[n for n in level if self._own(n).__value__ is None]
+                  for level in self._levels(names)]
+        return [level for level in levels if level]
+
+    def _levels(self, names):
+        """ Group the named Derived properties, and the Derived
+        properties they depend on (declared or traced), by level, so
+        that each property only depends on properties of earlier levels.
+        """
+        depth = {}
+
+        def visit(name, path):
+            if name in depth:
+                return depth[name]
+            deps = self._depends.get(name)
+            if deps is None:
+                deps = self._deps.get(name, ())
+            level = 0
+            for dep in deps:
+                if dep in self._derived and dep not in path:
+                    level = max(level, visit(dep, path | {dep}) + 1)
+            depth[name] = level
+            return level
+
+        for name in names:
+            visit(name, frozenset([name]))
+        levels = [[] for _ in range(max(depth.values()) + 1)]
+        for name in self._derived:
+            if name in depth:
+                levels[depth[name]].append(name)
+        return levels
+
+    @contextmanager
+    def _concurrent(self):
+        """ Context manager for running loaders in several threads.
+
+        An instance that is not `_threadsafe` is given the
+        book-keeping of a thread-safe model (lock, per-thread trace and
+        single-flight loading) until the end of the block; other
+        threads must not change it in the meantime.
+        """
+        if self._threadsafe:
+            yield
+            return
+        trace = self._trace
+        self._lock = threading.RLock()
+        if not isinstance(trace, _ContextTrace):
+            self._trace = _ContextTrace()
+        self._loading = {}
+        self._generation = 0
+        self._threadsafe = True
+        try:
+            yield
+        finally:
+            del self._threadsafe, self._lock, self._loading, self._generation
+            self._trace = trace
+
+    def _get_state(self, derived=True):
+        """ Return the state of this instance as a dict of plain values:
+        the properties that have been set, the cached Derived values
+        (if derived is True) and their traced dependencies, and the
+        other instance attributes.
+
+        The metadata of the properties (help, bounds, etc.) is taken
+        from the class, except for the state of the Parameters (value,
+        bounds, errors and free status).
+        """
+        with self._lock:
+            return self._collect_state(derived)
+
+    def _collect_state(self, derived):
+        """ Build the state returned by `_get_state` """
+        props = odict()
+        values = odict()
+        for name, prop in self._owned.items():
+            if name in self._derived:
+                if derived and prop.__value__ is not None:
+                    values[name] = prop.__value__
+            elif isinstance(prop, ParameterView):
+                # Stored in the arrays
+                continue
+            elif isinstance(prop, Parameter):
+                props[name] = (prop.__value__, prop.__bounds__,
+                               prop.__errors__, prop.__free__)
+            else:
+                props[name] = prop.__value__
+        state = dict(properties=props, derived=values,
+                     deps=dict(self._deps), missing=tuple(self._missing),
+                     attributes={k: v for k, v in self.__dict__.items()
+                                 if k not in _INTERNAL})
+        if self._array_storage:
+            array = self._array
+            state['array'] = (array.values, array.bounds, array.errors, array.free)
+        return state
+
+    def _set_state(self, state):
+        """ Restore the state returned by `_get_state` """
+        self._init_properties()
+        if self._array_storage:
+            array = self._array
+            for dest, values in zip((array.values, array.bounds, array.errors, array.free),
+                                    state['array']):
+                dest[:] = values
+        for name, value in state['properties'].items():
+            prop = self._params[name]._copy(_shallow_copy)
+            if isinstance(prop, Parameter):
+                prop.__value__, prop.__bounds__, prop.__errors__, prop.__free__ = value
+            else:
+                prop.__value__ = value
+            self._owned[name] = prop
+        for name, value in state['derived'].items():
+            self._own(name).__value__ = value
+        for name, deps in state['deps'].items():
+            self._set_deps(name, set(deps))
+        self._missing = {k: self._params[k] for k in state['missing']}
+        self.__dict__.update(state['attributes'])
+
     def _init_properties(self):
-        """ Loop through the list of Properties,
-        extract the derived and required properties and do the
-        appropriate book-keeping
-        """
-        self._missing = {}
-        for k, p in self.params.items():
-            if p.required:
-                self._missing[k] = p
-            if isinstance(p, Derived):
-                if p.loader is None:
-                    # Default to using _<param_name>
-                    p.loader = self.__getattribute__("_%s" % k)
-                elif isinstance(p.loader, str):
-                    p.loader = self.__getattribute__(p.loader)
+        """ Set up the (empty) store of private Property copies
+        and do the book-keeping for the required properties
+        """
+        if self._compiled != self._signature():
+            type(self)._compile()
+        self._owned = {}
+        self._missing = {k: self._params[k] for k in self._required}
+        # Traced dependencies of the Derived properties and their inverse
+        self._deps = {}
+        self._rdeps = {}
+        # Derived properties with unknown dependencies
+        self._untracked = set()
+        # Stack of the names read by the loaders being run
+        self._trace = []
+        self._invalidated = ()
+        # Properties changed in the current batch_update (and their
+        # previous state)
+        self._pending = None
+        # Memoized values of the Derived properties
+        self._memos = {}
+        # Free status and names of the free Parameters, with array
+        # storage (see `free_names`)
+        self._free_index = None
+        if self._array_storage:
+            self._array = self._array_template.copy()
+        if self._threadsafe or self._coroutines:
+            self._trace = _ContextTrace()
+        if self._coroutines:
+            # Tasks running the async loaders (see `aget`)
+            self._tasks = {}
+        if self._threadsafe:
+            self._lock = threading.RLock()
+            # Derived values being computed (see `_load_once`)
+            self._loading = {}
+            # Advanced by every change of the state
+            self._generation = 0
+        if self._background_cache is not None:
+            self._scheduled = _Scheduled()
+        if self._updaters:
+            # Values of the inputs of the Derived values, and the
+            # previous values with their inputs (see `_update_stale`)
+            self._snapshots = {}
+            self._stale = {}
+
+    def _own(self, name):
+        """ Return the private copy of the named Property.
+
+        The copy is made from the class-level prototype the first
+        time it is needed; Derived loaders are bound at that point.
+        With array storage, Parameters are views onto the arrays.
+        """
+        try:
+            return self._owned[name]
+        except KeyError:
+            pass
+        if self._threadsafe:
+            with self._lock:
+                prop = self._owned.get(name)
+                if prop is not None:
+                    return prop
+                return self._bind(name)
+        return self._bind(name)
+
+    def _bind(self, name):
+        """ Make the private copy of the named Property (see `_own`) """
+        # Raises KeyError for unknown names
+        proto = self._params[name]
+        if self._array_storage and name in self._array.index:
+            prop = ParameterView.bind(proto, self._array, self._array.index[name])
+        else:
+            prop = copy.deepcopy(proto)
+        if isinstance(prop, Derived):
+            if prop.loader is None:
+                # Default to using _<param_name>
+                prop.loader = self.__getattribute__("_%s" % name)
+            elif isinstance(prop.loader, str):
+                prop.loader = self.__getattribute__(prop.loader)
+            # Derived values are always computed by the instance
+            prop.clear_value()
+            if name not in self._depends:
+                self._untracked.add(name)
+        self._owned[name] = prop
+        return prop
+
+    def _peek(self, name):
+        """ Return the named Property for reading only.
+
+        This is the private copy if one exists, otherwise the shared
+        class-level prototype, which must not be modified.
+        """
+        prop = self._owned.get(name)
+        if prop is None:
+            if self._array_storage and name in self._array.index:
+                return self._own(name)
+            return self._params[name]
+        return prop
+
+    def _traced(self, names):
+        """ Record that the loader being traced, if any, read the
+        named properties (for the accessors that return several
+        properties or values at once).
+        """
+        if self._trace:
+            self._trace[-1].update(names)
+
+    def _value(self, name):
+        """ Return the value of the named Property without copying
+        it, unless the value is mutable or must be computed.
+        """
+        if name in self._derived:
+            return self._derived_value(name)
+        if self._trace:
+            self._trace[-1].add(name)
+        prop = self._owned.get(name)
+        if prop is None:
+            prop = self._peek(name)
+            if not _shareable(prop.value):
+                prop = self._own(name)
+        return prop.value
+
+    def _derived_value(self, name):
+        """ Return the value of the named Derived property, running
+        (and tracing) its loader if the value is not cached.
+        """
+        trace = self._trace
+        if trace:
+            trace[-1].add(name)
+        prop = self._owned.get(name)
+        if prop is None:
+            prop = self._own(name)
+        value = prop.__value__
+        if value is not None:
+            return value
+        if self._threadsafe:
+            return self._load_once(name, prop)
+        return self._load_derived(name, prop)
+
+    def _load_once(self, name, prop, retry=True):
+        """ Compute the value of a Derived property of a thread-safe
+        model.
+
+        Threads reading the property at the same time wait for a
+        single call of the loader. The loader runs without holding
+        the lock of the model, and its value is only stored if the
+        state did not change in the meantime (otherwise it is
+        computed again), so that the cached values can be read
+        without locking.
+
+        If retry is False, return None instead of waiting for another
+        thread or computing the value again.
+        """
+        while True:
+            with self._lock:
+                value = prop.__value__
+                if value is not None:
+                    return value
+                flight = self._loading.get(name)
+                owner = flight is None or flight.generation != self._generation
+                if owner:
+                    flight = self._loading[name] = _Flight(self._generation)
+            if not owner:
+                if not retry:
+                    return None
+                flight.done.wait()
+                continue
+
+            value = None
+            try:
+                # Computed on a copy, so that readers never see the
+                # value before it is checked against the generation
+                value = self._load_derived(name, copy.copy(prop))
+            finally:
+                with self._lock:
+                    if self._loading.get(name) is flight:
+                        del self._loading[name]
+                    current = flight.generation == self._generation
+                    if current:
+                        prop.__value__ = value
+                flight.done.set()
+            if current:
+                return value
+            if not retry:
+                return None
+
+    def _load_derived(self, name, prop):
+        """ Compute the value of a Derived property, or take it from
+        the memo if the property is memoized.
+        """
+        generation = self._generation
+        value, keys = self._lookup(name, prop)
+        if value is not None:
+            prop.set_value(value)
+        elif name in self._updaters and name in self._stale:
+            value = self._update_stale(name)
+            if value is not None:
+                prop.set_loaded(value)
+                self._store(name, prop, value, keys)
+        if value is None:
+            value = self._run_loader(name, prop)
+            self._store(name, prop, value, keys)
+        if name in self._updaters:
+            self._snapshot(name, generation)
+        return value
+
+    def _update_stale(self, name):
+        """ Compute the value of a Derived property with its updater,
+        from the value it had before it was cleared.
+
+        The updater is called with the previous value and an ordered
+        dictionary of the inputs of the property (see `_inputs`) that
+        changed since that value was computed, mapped to their
+        (old, new) values. It returns the new value, or NotImplemented
+        if the value must be computed by the loader. It should not
+        modify the previous value in place.
+
+        If none of the inputs changed, the previous value is returned
+        without calling the updater.
+
+        Returns None if there is no previous value, or if the updater
+        returned NotImplemented.
+        """
+        stale = self._stale.pop(name, None)
+        if stale is None:
+            return None
+        value, inputs = stale
+        changes = odict()
+        for input_name, old in inputs.items():
+            new = self._peek(input_name).value
+            if old is new:
+                continue
+            try:
+                same = bool(old == new)
+            except ValueError:
+                # Arrays
+                same = False
+            if not same:
+                changes[input_name] = (old, new)
+        if not changes:
+            return value
+
+        updater = self._updaters[name]
+        if isinstance(updater, str):
+            updater = getattr(self, updater)
+        # The updater reads the same inputs as the loader
+        self._trace.append(set())
+        try:
+            value = updater(value, changes)
+        finally:
+            self._trace.pop()
+        if value is NotImplemented:
+            return None
+        return value
+
+    def _snapshot(self, name, generation):
+        """ Record the values of the inputs of a Derived property that
+        was just computed (see `_update_stale`).
+
+        On a thread-safe model, nothing is recorded if the state
+        changed since the given generation.
+        """
+        inputs = self._inputs(name)
+        with self._lock:
+            if self._generation != generation:
+                return
+            if inputs is None:
+                self._snapshots.pop(name, None)
+            else:
+                self._snapshots[name] = odict((n, self._peek(n).value) for n in inputs)
+
+    def _lookup(self, name, prop):
+        """ Look for the value of a Derived property in its memo and
+        in the disk cache.
+
+        Returns the value (None if not found), and the keys to store
+        the computed value (see `_store`): the memo and the key of the
+        inputs in it, the disk cache key, and the generation of the
+        state, all taken before the loader runs.
+        """
+        generation = self._generation
+        memo = self._memos.get(name)
+        if memo is None and prop.memo:
+            memo = self._memos.setdefault(name, LRUCache(prop.memo, prop.memo_bytes))
+
+        key = None
+        if memo is not None:
+            key = self._fingerprint(name)
+            if key is None:
+                memo.misses += 1
+            else:
+                with self._lock:
+                    value = memo.get(key)
+                if value is not None:
+                    return value, (memo, key, None, generation)
+
+        disk_key = None
+        if prop.disk_cache and self._disk_cache is not None:
+            disk_key = self._disk_key(name, prop)
+        if disk_key is not None:
+            value = self._disk_cache.get(disk_key)
+            if value is not None:
+                return value, (memo, key, disk_key, generation)
+        return None, (memo, key, disk_key, generation)
+
+    def _store(self, name, prop, value, keys):
+        """ Store the computed value of a Derived property in its memo
+        and in the disk cache, with the keys from `_lookup`.
+
+        Nothing is stored if the inputs changed while the loader ran:
+        on a thread-safe model, if the generation changed, and
+        otherwise if the keys are not the same any more (e.g., an
+        async loader read an input after it was changed).
+        """
+        memo, key, disk_key, generation = keys
+        with self._lock:
+            if self._generation != generation:
+                return
+            if memo is not None:
+                # The inputs may only be known once the loader has run
+                after = self._fingerprint(name)
+                if after is not None and key in (None, after):
+                    memo.put(after, value)
+            if disk_key is not None and self._disk_key(name, prop) != disk_key:
+                return
+        if disk_key is not None:
+            self._disk_cache.put(disk_key, value)
+
+    def _disk_key(self, name, prop):
+        """ Return the `DiskCache` key of a Derived property, or None
+        if the inputs can not be hashed.
+
+        The key is built from the Model class, the loader and its
+        version, and the values of the declared inputs of the loader
+        (or of all the non-Derived properties if they are not declared).
+        """
+        inputs = self._inputs(name, traced=False)
+        if inputs is None:
+            inputs = tuple(n for n in self._params if n not in self._derived)
+        cls = self.__class__
+        loader = getattr(prop.loader, '__qualname__', repr(prop.loader))
+        try:
+            return self._disk_cache.key(
+                cls.__module__, cls.__qualname__, name, loader, prop.version,
+                inputs, tuple(self._peek(n).value for n in inputs))
+        except TypeError:
+            return None
+
+    def _run_loader(self, name, prop):
+        """ Run the loader of a Derived property, tracing the names
+        of the properties that it reads.
+        """
+        trace = self._trace
+        trace.append(set())
+        try:
+            value = prop.value
+        finally:
+            names = trace.pop()
+        self._record_deps(name, names)
+        return value
+
+    def _record_deps(self, name, names):
+        """ Record the names read by the loader of a Derived property
+        as its dependencies.
+
+        Nothing is recorded if the dependencies are declared, or if
+        the class does not trust the trace (see `_trace_dependencies`).
+        A loader that reads no property depends on some other state,
+        so its value is left to be always cleared.
+        """
+        if name in self._depends or not self._tracing:
+            return
+        names = set(names)
+        names.discard(name)
+        with self._lock:
+            self._set_deps(name, names)
+            if not names:
+                del self._deps[name]
+                self._untracked.add(name)
+
+    def _inputs(self, name, traced=True):
+        """ Return the names of the (non-Derived) properties that the
+        named Derived property depends on, or None if not known.
+
+        If traced is False, only the declared dependencies are used.
+        """
+        found = set()
+        seen = set([name])
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            deps = self._depends.get(current)
+            if deps is None and traced:
+                deps = self._deps.get(current)
+            if deps is None:
+                return None
+            for dep in deps:
+                if dep not in self._derived:
+                    found.add(dep)
+                elif dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return tuple(n for n in self._params if n in found)
+
+    def _fingerprint(self, name):
+        """ Return a hashable key built from the values of the inputs
+        of the named Derived property, or None if that is not possible.
+        """
+        inputs = self._inputs(name)
+        if inputs is None:
+            return None
+        key = (inputs, tuple(self._peek(n).value for n in inputs))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def memo_info(self, name=None):
+        """ Return the counters of the memoized Derived properties
+
+        Parameters
+        ----------
+        name : str or None
+           If a string, get the counters of the named Derived property
+
+           If None, get the counters of all memoized Derived properties
+
+        Returns
+        -------
+        info : `~collections.OrderedDict`
+           The 'hits', 'misses', 'evictions', 'size' and 'nbytes' of the memo
+        """
+        if name is not None:
+            name = self._mapping.get(name, name)
+            memo = self._memos.get(name)
+            if memo is None:
+                memo = LRUCache(self._params[name].memo)
+            return memo.info()
+        return odict([(n, self.memo_info(n)) for n in self._derived
+                      if self._params[n].memo])
+
+    def _set_deps(self, name, names):
+        """ Record the traced dependencies of a Derived property
+        """
+        names.discard(name)
+        for dep in self._deps.get(name, ()):
+            self._rdeps[dep].discard(name)
+        for dep in names:
+            self._rdeps.setdefault(dep, set()).add(name)
+        self._deps[name] = frozenset(names)
+        self._untracked.discard(name)
+
+    def _downstream(self, names):
+        """ Return the set of Derived properties that depend on any of
+        the named properties, following the dependency graph.
+        """
+        found = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            for graph in (self._rdeps, self._rdepends):
+                for dep in graph.get(name, ()):
+                    if dep not in found:
+                        found.add(dep)
+                        stack.append(dep)
+        return found
+
+    def _invalidate(self, names):
+        """ Clear the values of the Derived properties that depend
+        (directly or transitively) on any of the named properties.
+
+        Derived properties with unknown dependencies are always
+        cleared.
+        """
+        found = self._downstream(names)
+        found.update(self._untracked)
+        if self._coroutines:
+            self._cancel_tasks(found.union(names))
+        found.difference_update(names)
+
+        cleared = []
+        for name in found:
+            prop = self._owned.get(name)
+            if prop is not None and prop.__value__ is not None:
+                if name in self._updaters:
+                    self._stash(name, prop.__value__)
+                prop.clear_value()
+                cleared.append(name)
+        self._invalidated = tuple(n for n in self._derived if n in cleared)
+
+    def _stash(self, name, value):
+        """ Keep the value of a Derived property that is cleared, with
+        the values of its inputs, for its updater (see `_update_stale`).
+        """
+        inputs = self._snapshots.pop(name, None)
+        if inputs is not None:
+            self._stale[name] = (value, inputs)
 
     def get_params(self, pnames=None):
         """ Return a list of Parameter objects
@@ -317,14 +2061,16 @@ class Model:
             list of Parameters
 
         """
-        l = []
+        names = self._get_param_names(pnames)
+        self._traced(names)
+        return [self._own(n) for n in names]
+
+    def _get_param_names(self, pnames=None):
+        """ Return the names of the Parameter objects in pnames
+        """
         if pnames is None:
-            pnames = self.params.keys()
-        for pname in pnames:
-            p = self.params[pname]
-            if isinstance(p, Parameter):
-                l.append(p)
-        return l
+            pnames = self._params.keys()
+        return [n for n in pnames if isinstance(self._params[n], Parameter)]
 
     def param_values(self, pnames=None):
         """ Return an array with the parameter values
@@ -343,11 +2089,152 @@ class Model:
         values : `np.array`
             Parameter values
 
+        With array storage this is a copy of the value array, with
+        NaN for values that are not set.
         """
-        l = self.get_params(pnames)
-        v = [p.value for p in l]
+        if self._array_storage and pnames is None:
+            self._traced(self._array.names)
+            return self._array.values.copy()
+        names = self._get_param_names(pnames)
+        self._traced(names)
+        if self._array_storage:
+            return self._array.values[self._array_slots(names)]
+        v = [self._peek(n).value for n in names]
         return np.array(v)
 
+    def set_param_values(self, values, pnames=None):
+        """ Set the values of a set of parameters at once
+
+        All the values are checked before any of them are set, and the
+        Derived properties are cleared and `_cache` called only once.
+
+        Parameters
+        ----------
+        values : array-like
+           The new parameter values
+
+        pname : list or None
+           If a list, set the values of the `Parameter` objects with those names
+
+           If none, set the values of all the `Parameter` objects
+        """
+        names = self._get_param_names(pnames)
+        if len(values) != len(names):
+            msg = "Expected %i values, got %i" % (len(names), len(values))
+            raise ValueError(msg)
+
+        if self._array_storage:
+            changed = self._set_array_values(names, values)
+            if self._pending is not None:
+                for name in changed:
+                    self._writable(name)
+        else:
+            props = [self._writable(n) for n in names]
+            for name, prop, value in zip(names, props, values):
+                try:
+                    prop.check_type(value)
+                except TypeError as msg:
+                    raise TypeError("Failed to set parameter %s" % name) from msg
+                prop.check_bounds(value)
+            changed = []
+            for name, prop, value in zip(names, props, values):
+                if prop.value != value:
+                    prop.set_value(value)
+                    changed.append(name)
+
+        if changed:
+            self._commit(changed)
+
+    def free_names(self):
+        """ Return the names of the free `Parameter` objects
+
+        With array storage, the names are kept until the array of the
+        free status changes.
+        """
+        if self._array_storage:
+            free = self._array.free.tobytes()
+            if self._free_index is None or self._free_index[0] != free:
+                names = self._array.names
+                index = np.flatnonzero(self._array.free)
+                self._free_index = (free, tuple(names[i] for i in index))
+            return self._free_index[1]
+        names = self._get_param_names()
+        return tuple(n for n in names if self._peek(n).free)
+
+    def free_values(self):
+        """ Return an array with the values of the free parameters
+        """
+        names = self.free_names()
+        self._traced(names)
+        if self._array_storage:
+            return self._array.values[self._array_slots(names)]
+        return np.array([self._peek(n).value for n in names])
+
+    def set_free_values(self, values):
+        """ Set the values of the free parameters (e.g., from an optimizer)
+
+        The Derived properties are cleared and `_cache` is called
+        once for the whole vector (see `set_param_values`).
+        """
+        self.set_param_values(values, self.free_names())
+
+    def free_bounds(self):
+        """ Return an N x 2 array with the bounds of the free parameters
+
+        Missing bounds are set to -inf and inf.
+        """
+        names = self.free_names()
+        if self._array_storage:
+            bounds = self._array.bounds[self._array_slots(names)]
+        else:
+            bounds = np.full((len(names), 2), np.nan)
+            for i, name in enumerate(names):
+                if self._peek(name).bounds is not None:
+                    bounds[i] = self._peek(name).bounds
+        bounds[:, 0][np.isnan(bounds[:, 0])] = -np.inf
+        bounds[:, 1][np.isnan(bounds[:, 1])] = np.inf
+        return bounds
+
+    def _array_slots(self, pnames):
+        """ Return the slots of the named parameters in the array storage
+        """
+        index = self._array.index
+        return [index[n] for n in self._get_param_names(pnames)]
+
+    def _set_array_values(self, names, values):
+        """ Check and set values in the array storage.
+
+        Returns the names of the parameters whose value changed.
+        """
+        slots = [self._array.index[n] for n in names]
+        values = np.asarray(values)
+        if values.dtype.kind == 'O':
+            for name, value in zip(names, values):
+                try:
+                    self._params[name].check_type(value)
+                except TypeError as msg:
+                    raise TypeError("Failed to set parameter %s" % name) from msg
+        elif values.dtype.kind not in 'biuf':
+            raise TypeError("Failed to set parameter values of type %s" % values.dtype)
+        try:
+            values = values.astype(float, copy=False)
+        except (TypeError, ValueError) as msg:
+            raise TypeError("Failed to set parameter values") from msg
+        bounds = self._array.bounds[slots]
+        # NaN (i.e., None) is outside the bounds, as in Parameter.check_bounds
+        bounded = ~np.isnan(bounds).all(axis=1)
+        inside = (bounds[:, 0] <= values) & (values <= bounds[:, 1])
+        outside = bounded & ~inside
+        if outside.any():
+            i = np.flatnonzero(outside)[0]
+            msg = "Value of %s outside bounds: %.2g [%.2g,%.2g]"
+            msg = msg % (names[i], values[i], bounds[i, 0], bounds[i, 1])
+            raise ValueError(msg)
+        old = self._array.values[slots]
+        self._array.values[slots] = values
+        changed = ~((old == values) | ((old != old) & (values != values)))
+        return [names[i] for i in np.flatnonzero(changed)]
+
     def param_errors(self, pnames=None):
         """ Return an array with the parameter errors
 
@@ -363,31 +2250,438 @@ class Model:
         ~numpy.array of parameter errors
 
         Note that this is a N x 2 array.
+        With array storage, errors that are not set are NaN.
         """
-        l = self.get_params(pnames)
-        v = [p.errors for p in l]
+        if self._array_storage and pnames is None:
+            self._traced(self._array.names)
+            return self._array.errors.copy()
+        names = self._get_param_names(pnames)
+        self._traced(names)
+        if self._array_storage:
+            return self._array.errors[self._array_slots(names)]
+        v = [self._peek(n).errors for n in names]
         return np.array(v)
 
     def clear_derived(self):
         """ Reset the value of all Derived properties to None
 
-        This is called by setp (and by extension __setattr__)
+        Note that setp (and by extension attribute assignment) only
+        clears the Derived properties that depend on the parameter.
         """
-        for p in self.params.values():
-            if isinstance(p, Derived):
+        if self._coroutines:
+            self._cancel_tasks()
+        if self._updaters:
+            # Compute the values again from scratch
+            self._snapshots.clear()
+            self._stale.clear()
+        cleared = []
+        for name, p in self._owned.items():
+            if isinstance(p, Derived) and p.__value__ is not None:
                 p.clear_value()
+                cleared.append(name)
+        self._invalidated = tuple(n for n in self._derived if n in cleared)
+
+    def dependencies(self, name=None):
+        """ Return the dependencies of the Derived properties
+
+        Parameters
+        ----------
+        name : str or None
+           If a string, get the dependencies of the named Derived property
+
+           If None, get the dependencies of all Derived properties
+
+        Returns
+        -------
+        deps : tuple or `~collections.OrderedDict`
+           The names of the properties read by the loader, or None if
+           they are not known (i.e., not declared and not yet traced)
+        """
+        if name is not None:
+            name = self._mapping.get(name, name)
+            if name in self._depends:
+                return self._depends[name]
+            if name in self._deps:
+                return tuple(n for n in self._params if n in self._deps[name])
+            if name not in self._derived:
+                raise KeyError(name)
+            return None
+        return odict([(n, self.dependencies(n)) for n in self._derived])
+
+    def dependents(self, name):
+        """ Return the names of the Derived properties that depend,
+        directly or transitively, on the named property.
+        """
+        name = self._mapping.get(name, name)
+        found = self._downstream((name,))
+        return tuple(n for n in self._derived if n in found)
+
+    @property
+    def last_invalidated(self):
+        """ Names of the Derived properties whose values were
+        cleared by the last parameter change.
+        """
+        return self._invalidated
 
     def todict(self):
         """ Return self cast as an '~collections.OrderedDict' object
         """
         ret = odict(name=self.__class__.__name__)
-        ret.update(self.params)
+        for name in self._params:
+            ret[name] = self._own(name)
+        self._traced(self._params)
         return ret
 
-    def dump(self):
+    def _yaml_dict(self):
+        """ Return the properties to dump, i.e., `todict` without the
+        Derived properties """
+        ret = odict(name=self.__class__.__name__)
+        for name in self._params:
+            if name not in self._derived:
+                ret[name] = self._peek(name)
+        return ret
+
+    def dump(self, stream=None):
         """ Dump this object as a yaml string
+
+        The Derived properties are not included. The output can be
+        read back with `from_yaml`.
+
+        Parameters
+        ----------
+        stream : file or None
+            Write to this file, rather than returning a string.
+        """
+        return yaml.dump(self._yaml_dict(), stream, Dumper=Dumper)
+
+    @staticmethod
+    def dump_all(models, stream=None):
+        """ Dump Models as a stream of yaml documents
+
+        The models are written one at a time, so that they can come
+        from a generator.
+
+        Parameters
+        ----------
+        models : iterable
+            The Model instances.
+        stream : file or None
+            Write to this file, rather than returning a string.
+        """
+        docs = (m._yaml_dict() for m in models)
+        return yaml.dump_all(docs, stream, Dumper=Dumper)
+
+    @classmethod
+    def _from_yaml_dict(cls, data):
+        """ Build an instance from a dictionary read from yaml """
+        kwargs = odict()
+        for name, value in data.items():
+            if name == 'name' and name not in cls._params:
+                # The class name
+                continue
+            target, fields = cls._setters.get(name, (None, True))
+            if target in cls._derived:
+                continue
+            if not fields and isinstance(value, Mapping) and 'value' in value:
+                # A Property written as {value: x}
+                value = value['value']
+            kwargs[name] = value
+        return cls(**kwargs)
+
+    @classmethod
+    def from_yaml(cls, stream):
+        """ Build an instance from a yaml document (see `dump`)
+
+        Parameters
+        ----------
+        stream : str or file
+            The yaml document.
+        """
+        return cls._from_yaml_dict(yaml.load(stream, Loader=Loader))
+
+    @classmethod
+    def from_yaml_all(cls, stream):
+        """ Generate instances from a stream of yaml documents (see
+        `dump_all`), parsing one document at a time.
+
+        Parameters
+        ----------
+        stream : str or file
+            The yaml documents.
+        """
+        for data in yaml.load_all(stream, Loader=Loader):
+            yield cls._from_yaml_dict(data)
+
+    @classmethod
+    def load(cls, filename):
+        """ Build an instance from a yaml file (see `dump`) """
+        with open(filename) as stream:
+            return cls.from_yaml(stream)
+
+    @classmethod
+    def load_all(cls, filename):
+        """ Generate instances from a yaml file with one document per
+        instance (see `dump_all`) """
+        with open(filename) as stream:
+            yield from cls.from_yaml_all(stream)
+
+    def save_snapshot(self, filename):
+        """ Write a binary snapshot of this instance, including the
+        cached values of the Derived properties (see `pymodeler.snapshot`).
+
+        Arrays are written as raw bytes, so this costs about as much
+        as writing the array data.
+
+        Parameters
+        ----------
+        filename : str
+            The file name.
+        """
+        snapshot.dump((self.__class__, self._get_state()), filename)
+
+    @classmethod
+    def load_snapshot(cls, filename, mmap_mode=True):
+        """ Restore an instance from a snapshot (see `save_snapshot`).
+
+        Parameters
+        ----------
+        filename : str
+            The file name.
+        mmap_mode : bool
+            Memory-map the file, so that the arrays of the Derived
+            values are read lazily (and are read-only).
+
+        Returns
+        -------
+        model : `Model`
+            The instance, of the class it was saved from (which must
+            be this class or a sub-class).
+        """
+        klass, state = snapshot.load(filename, mmap_mode)
+        if not issubclass(klass, cls):
+            raise TypeError("Snapshot of %s, not %s" % (klass.__name__, cls.__name__))
+        model = klass.__new__(klass)
+        model._set_state(state)
+        return model
+
+    @classmethod
+    def record_dtype(cls):
+        """
+        Return the structured dtype of the records of this Model class.
+
+        There is one field per Parameter, with the sub-fields 'value',
+        'errors' (low, high), 'bounds' (low, high) and 'free'. Missing
+        values, errors and bounds (i.e., None) are stored as NaN.
+
+        Raises TypeError if a Parameter can not be stored as a float.
+        """
+        if cls._record_dtype is None:
+            fields = []
+            for name, prop in cls._params.items():
+                if not isinstance(prop, Parameter):
+                    continue
+                dtype = prop.dtype
+                if dtype is not None and not isinstance(0.0, dtype):
+                    msg = "Parameter %s of type %s can not be stored in a record"
+                    raise TypeError(msg % (name, dtype))
+                fields.append((name, _PARAM_RECORD))
+            cls._record_dtype = np.dtype(fields)
+        return cls._record_dtype
+
+    def to_record(self):
+        """
+        Return the state of the Parameters as a structured record
+        (see `record_dtype`).
+
+        Records can be stacked into an array (e.g., with `np.array`
+        or by assigning them to the rows of an array of the same
+        dtype), which can be saved with `np.save`.
+
+        Returns
+        -------
+        record : `~numpy.void`
+            The record.
+        """
+        nan = np.nan
+        fields = []
+        for name in self.record_dtype().names:
+            prop = self._peek(name)
+            value, errors, bounds = prop.value, prop.errors, prop.bounds
+            if errors is not None and np.isscalar(errors):
+                errors = (errors, errors)
+            fields.append((nan if value is None else value,
+                           (nan, nan) if errors is None else errors,
+                           (nan, nan) if bounds is None else bounds,
+                           prop.free))
+        return np.array(tuple(fields), dtype=self._record_dtype)[()]
+
+    @classmethod
+    def from_record(cls, record, **kwargs):
+        """
+        Build an instance from a record (see `to_record`).
+
+        Parameters
+        ----------
+        record : `~numpy.void`
+            The record, e.g., a row of an array (possibly memory-mapped)
+            with the dtype from `record_dtype`.
+        kwargs :
+            Other attributes, set with `set_attributes`.
+
+        Returns
+        -------
+        model : `Model`
+            The new instance.
+        """
+        model = cls.__new__(cls)
+        model._init_properties()
+        for name, (value, errors, bounds, free) in zip(record.dtype.names, record.item()):
+            if cls._array_storage:
+                prop = model._own(name)
+            else:
+                prop = cls._params[name]._copy(_shallow_copy)
+                model._owned[name] = prop
+            try:
+                prop.set(bounds=_pair(bounds), errors=_pair(errors), free=free,
+                         value=None if value != value else value)
+            except TypeError as msg:
+                raise TypeError("Failed to set parameter %s" % name) from msg
+            model._missing.pop(name, None)
+        model.set_attributes(**kwargs)
+        model._cache()
+        return model
+
+    def _schedule_cache(self, names):
+        """ Schedule the update of the cache in a background thread,
+        after a change of the named parameters.
+
+        The update runs once there has been no change for
+        `_background_cache` seconds: it calls `_cache_many` with all
+        the changed parameters, then computes again the Derived values
+        that were cleared. Reading one of those values while it is
+        computed waits for that computation.
+
+        An error raised by the hook in a previous update is raised
+        here, once the new update is scheduled.
+        """
+        scheduled = self._scheduled
+        scheduled.names.update(names)
+        scheduled.derived.update(self._invalidated)
+        # The update in progress is superseded
+        scheduled.derived.update(scheduled.running)
+        scheduled.due = time.monotonic() + self._background_cache
+        scheduled.idle.clear()
+        if scheduled.timer is None:
+            self._start_timer(self._background_cache)
+        self._raise_cache_error()
+
+    def _raise_cache_error(self):
+        """ Raise the error of the cache hook in the background, if any """
+        with self._lock:
+            error, self._scheduled.error = self._scheduled.error, None
+        if error is not None:
+            raise error
+
+    def _start_timer(self, delay):
+        """ Run `_update_cache` in a background thread after a delay """
+        timer = threading.Timer(delay, self._update_cache)
+        timer.daemon = True
+        self._scheduled.timer = timer
+        timer.start()
+
+    def _update_cache(self):
+        """ Update the cache in the background (see `_schedule_cache`).
+
+        A newer change supersedes the update: the Derived values that
+        are not computed yet are left to the next update, and a value
+        being computed is dropped.
+
+        An error of the cache hook stops the update; it is kept and
+        raised by `wait_cache` or by the next change. Errors of the
+        loaders are left to be raised when the values are read.
+        """
+        scheduled = self._scheduled
+        with self._lock:
+            delay = scheduled.due - time.monotonic()
+            if delay > 0:
+                # Changed again since the timer was started
+                self._start_timer(delay)
+                return
+            names = tuple(n for n in self._params if n in scheduled.names)
+            derived = scheduled.running = scheduled.derived
+            scheduled.names, scheduled.derived = set(), set()
+            scheduled.timer = None
+            generation = self._generation
+        try:
+            if names:
+                try:
+                    self._cache_many(names)
+                except Exception as err: # pylint: disable=broad-except
+                    with self._lock:
+                        scheduled.error = err
+                    return
+            for level in self._levels(derived) if derived else ():
+                for name in level:
+                    if self._generation != generation:
+                        return
+                    prop = self._own(name)
+                    if prop.__value__ is None:
+                        try:
+                            self._load_once(name, prop, retry=False)
+                        except Exception: # pylint: disable=broad-except
+                            pass
+        finally:
+            with self._lock:
+                if scheduled.running is derived:
+                    scheduled.running = set()
+                if scheduled.timer is None:
+                    scheduled.idle.set()
+
+    def wait_cache(self, timeout=None):
+        """ Wait for the background update of the cache (see
+        `_background_cache`) to finish.
+
+        Parameters
+        ----------
+        timeout : float or None
+            The maximum time to wait (in seconds).
+
+        Returns
+        -------
+        done : bool
+            False if the update was still running after the timeout.
+
+        Raises
+        ------
+        Exception
+            The error raised by the cache hook in the background.
+        """
+        if self._background_cache is None:
+            return True
+        done = self._scheduled.idle.wait(timeout)
+        self._raise_cache_error()
+        return done
+
+    def _cache_many(self, names):
+        """
+        Method called once after a group of parameters is updated
+        (e.g., by `set_param_values` or at the end of a
+        `batch_update`).
+
+        By default this calls `_cache` once, with the parameter name
+        if only one parameter changed, otherwise with None.
+        Sub-classes can override this to use the names.
+
+        Parameters
+        ----------
+        names : tuple
+           The names of the changed parameters.
+
+        Returns
+        -------
+        None
         """
-        return yaml.dump(self.todict())
+        self._cache(names[0] if len(names) == 1 else None)
 
     def _cache(self, name=None):
         """
@@ -13,8 +13,10 @@ from other model properties.
 """
 from __future__ import absolute_import, division, print_function
 
+import asyncio
+import inspect
 from copy import deepcopy
-from numbers import Number
+from numbers import Number, Real
 from collections import OrderedDict as odict
 
 import numpy as np
@@ -28,7 +30,9 @@ except NameError:
 
 def is_none(val):
     """Check for none as string"""
-    return val in [None, 'none', 'None']
+    if val is None:
+        return True
+    return isinstance(val, basestring) and val in ['none', 'None']
 
 
 def asscalar(a):
@@ -45,6 +49,62 @@ def asscalar(a):
         return np.asarray(a).item()
 
 
+# Exact types of the values that asscalar returns unchanged
+_PLAIN_TYPES = frozenset([bool, int, float, complex, str, type(None)])
+# Faster equivalents of asscalar for common numpy scalars
+_SCALAR_TYPES = {np.float64: float, np.float32: float, np.int64: int,
+                 np.int32: int, np.bool_: bool}
+# Exact types of the real numbers that can be passed straight to float
+_REAL_TYPES = frozenset([int, np.float64, np.float32, np.int64, np.int32])
+
+_type_checkers = {}
+
+
+def type_checker(dtype):
+    """Return a function that raises TypeError if a value is not an
+    instance of dtype (None is always accepted, as is any value if
+    dtype is None).
+
+    The checkers are built once per dtype, and remember the result of
+    the isinstance check for each exact type of value, which avoids
+    the (slow) checks against abstract classes such as `numbers.Number`.
+    """
+    try:
+        return _type_checkers[dtype]
+    except KeyError:
+        checker = _type_checkers[dtype] = _make_type_checker(dtype)
+        return checker
+    except TypeError:
+        # Not hashable
+        return _make_type_checker(dtype)
+
+
+def _check_nothing(value):
+    """Type checker for properties without a dtype"""
+    #pylint: disable=unused-argument
+    return
+
+
+def _make_type_checker(dtype):
+    """Build the checker for `type_checker`"""
+    if dtype is None:
+        return _check_nothing
+
+    accepted = {}
+
+    def check(value):
+        vtype = type(value)
+        try:
+            valid = accepted[vtype]
+        except KeyError:
+            valid = accepted[vtype] = isinstance(value, dtype)
+        if valid or is_none(value):
+            return
+        msg = "Value of type %s, when %s was expected." % (vtype, dtype)
+        raise TypeError(msg)
+    return check
+
+
 def defaults_docstring(defaults, header=None, indent=None, footer=None):
     """Return a docstring from a list of defaults.
     """
@@ -107,6 +167,30 @@ class Meta(type): #pragma: no cover
         return cls._doc + cls.defaults_docstring(**kwargs)
 
 
+class MetaAttribute:
+    """Descriptor for an item of the metadata record of a Property.
+
+    The record is shared by all the copies of a Property, so setting
+    an item replaces the record of this instance by a modified copy.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj._meta[self.name]
+        except (AttributeError, KeyError) as err:
+            raise AttributeError(self.name) from err
+
+    def __set__(self, obj, value):
+        meta = dict(obj._meta)
+        meta[self.name] = value
+        obj._meta = meta
+
+
 class Property:
     """Base class for model properties.
 
@@ -121,13 +205,17 @@ class Property:
     The pymodeler.model.Model class maps from property names to
     Property instances.
 
+    The value is kept in a slot, while the other attributes (help,
+    format, dtype, etc.) are kept in a metadata record that is shared
+    by all the copies of the Property.
+
     """
     __metaclass__ = Meta
 
-    __value__ = None
+    __slots__ = ('__value__', '_meta')
 
     defaults = [
-        ('value', __value__, 'Property value'),
+        ('value', None, 'Property value'),
         ('help', "", 'Help description'),
         ('format', '%s', 'Format string for printing'),
         ('dtype', None, 'Data type'),
@@ -139,8 +227,49 @@ class Property:
     @defaults_decorator(defaults)
     def __init__(self, **kwargs):
         self._load(**kwargs)
-        if self.__value__ is None and self.__dict__['default'] is not None:
-            self.set_value(self.__dict__['default'])
+        if self.__value__ is None and self._meta['default'] is not None:
+            self.set_value(self._meta['default'])
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._setup()
+
+    @classmethod
+    def _setup(cls):
+        """Add a `MetaAttribute` for each of the defaults that is not
+        part of the state of the Property (e.g., value or bounds)"""
+        for key, _, _ in cls.defaults:
+            if not hasattr(cls, key):
+                setattr(cls, key, MetaAttribute(key))
+        cls._meta_keys = tuple(k for k, _, _ in cls.defaults
+                               if isinstance(getattr(cls, k), MetaAttribute))
+        # The slot descriptors, bypassing any properties of sub-classes
+        cls._slot_members = tuple(
+            c.__dict__[n] for c in cls.__mro__
+            for n in c.__dict__.get('__slots__', ()) if n != '_meta')
+
+    def __copy__(self):
+        return self._copy(lambda x: x)
+
+    def __deepcopy__(self, memo):
+        return self._copy(lambda x: deepcopy(x, memo), memo)
+
+    def _copy(self, copier, memo=None):
+        """Copy the state, sharing the metadata record"""
+        cls = self.__class__
+        new = cls.__new__(cls)
+        if memo is not None:
+            memo[id(self)] = new
+        new._meta = self._meta
+        if hasattr(self, '__dict__'):
+            new.__dict__.update(copier(self.__dict__))
+        for member in self._slot_members:
+            try:
+                value = member.__get__(self, cls)
+            except AttributeError:
+                continue
+            member.__set__(new, copier(value))
+        return new
 
     def __str__(self):
         return self.__value__.__str__()
@@ -149,7 +278,8 @@ class Property:
         return self.__value__.__str__()
 
     def _load(self, **kwargs):
-        """Load kwargs key,value pairs into __dict__
+        """Load kwargs key,value pairs into the metadata record and
+        the state of the Property
         """
         defaults = {d[0]:d[1] for d in self.defaults}
         # Require kwargs are in defaults
@@ -160,11 +290,11 @@ class Property:
                 raise AttributeError(msg)
         defaults.update(kwargs)
 
-        # This doesn't overwrite the properties
-        self.__dict__.update(defaults)
+        # The metadata record (the properties are set below)
+        self._meta = {k: defaults[k] for k in self._meta_keys}
 
         # This should now be set
-        self.check_type(self.__dict__['default'])
+        self.check_type(self._meta['default'])
 
         # This sets the underlying property values (i.e., __value__)
         self.set(**defaults)
@@ -248,6 +378,18 @@ class Property:
         """
         return yaml.dump(self)
 
+    @staticmethod
+    def representer(dumper, data):
+        """
+        Represent as a flow mapping of `todict`
+
+        http://stackoverflow.com/a/14001707/4075339
+        http://stackoverflow.com/a/21912744/4075339
+        """
+        tag = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
+        return dumper.represent_mapping(
+            tag, data.todict().items(), flow_style=True)
+
     def check_bounds(self, value):
         """Hook for bounds-checking, invoked during assignment.
 
@@ -264,15 +406,9 @@ class Property:
 
         will not raise an exception if either value or self.dtype is None
         """
-        if self.__dict__['dtype'] is None:
-            return
-        if is_none(value):
-            return
-        if isinstance(value, self.__dict__['dtype']):
-            return
-        msg = "Value of type %s, when %s was expected." % (
-            type(value), self.__dict__['dtype'])
-        raise TypeError(msg)
+        type_checker(self._meta['dtype'])(value)
+
+Property._setup()
 
 
 class Derived(Property):
@@ -283,10 +419,41 @@ class Derived(Property):
     string for printing, and specifying a 'loader' function by name
     that is used to compute the value of the property.
 
+    The names of the properties that the loader depends on can be
+    declared with 'depends'. Otherwise the Model records them by
+    tracing which properties the loader reads.
+
+    Loaders flagged as 'vectorized' can be evaluated on whole columns
+    of parameter values by a `pymodeler.batch.ModelBatch`.
+
+    Setting 'memo' keeps the values computed for that many parameter
+    points (least recently used), so that a Model returning to an
+    earlier point does not need to call the loader again.
+
+    Setting 'disk_cache' stores the computed values in the
+    `pymodeler.cache.DiskCache` of the Model class; 'version' should
+    be changed whenever the loader changes.
+
+    The loader can be a coroutine function (``async def``); the value
+    should then be read with `Model.aget` inside an event loop.
+
+    An 'updater' (by default the method '_<name>_update' of the Model,
+    if it exists) computes the new value from the previous one after
+    a change of the parameters (see `Model._update_stale`).
+
     """
 
+    __slots__ = ()
+
     defaults = deepcopy(Property.defaults) + [
-        ('loader', None, 'Function to load datum')
+        ('loader', None, 'Function to load datum'),
+        ('depends', None, 'Names of the properties this depends on'),
+        ('vectorized', False, 'Can the loader be evaluated on arrays?'),
+        ('memo', 0, 'Number of computed values to memoize'),
+        ('memo_bytes', None, 'Maximum size of the memoized values (bytes)'),
+        ('disk_cache', False, 'Store the computed values on disk?'),
+        ('version', None, 'Version of the loader (for the disk cache)'),
+        ('updater', None, 'Function to update the value after a change'),
     ]
 
     @defaults_decorator(defaults)
@@ -307,22 +474,37 @@ class Derived(Property):
 
         if self.__value__ is None:
             try:
-                loader = self.__dict__['loader']
+                loader = self._meta['loader']
             except KeyError as err: #pragma: no cover
                 raise AttributeError("Loader is not defined") from err
 
             # Try to run the loader.
             # Don't catch expections here, let the Model class figure it out
             val = loader()
-
-            # Try to set the value
-            try:
-                self.set_value(val)
-            except TypeError as err:
-                msg = "Loader must return variable of type %s or None, got %s" % (self.__dict__['dtype'], type(val))
-                raise TypeError(msg) from err
+            if inspect.iscoroutine(val):
+                val = self._run_coroutine(val)
+            self.set_loaded(val)
         return self.__value__
 
+    @staticmethod
+    def _run_coroutine(coro):
+        """Run the coroutine returned by an async loader to completion"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        coro.close()
+        raise RuntimeError("Loader is a coroutine function: "
+                           "use Model.aget inside an event loop")
+
+    def set_loaded(self, val):
+        """Set the value returned by the loader, checking its type"""
+        try:
+            self.set_value(val)
+        except TypeError as err:
+            msg = "Loader must return variable of type %s or None, got %s" % (self._meta['dtype'], type(val))
+            raise TypeError(msg) from err
+
 
 class Parameter(Property):
     """Property sub-class for defining a numerical Parameter.
@@ -334,16 +516,13 @@ class Parameter(Property):
 
     """
 
-    __value__ = None
-    __bounds__ = None
-    __free__ = False
-    __errors__ = None
+    __slots__ = ('__bounds__', '__errors__', '__free__')
 
     # Better to keep the structure consistent with Property
     defaults = deepcopy(Property.defaults) + [
-        ('bounds', __bounds__, 'Allowed bounds for value'),
-        ('errors', __errors__, 'Errors on this parameter'),
-        ('free', __free__, 'Is this propery allowed to vary?'),
+        ('bounds', None, 'Allowed bounds for value'),
+        ('errors', None, 'Errors on this parameter'),
+        ('free', False, 'Is this propery allowed to vary?'),
     ]
     # Overwrite the default dtype
     idx = [d[0] for d in defaults].index('dtype')
@@ -359,12 +538,18 @@ class Parameter(Property):
         be cast to a scalar.
 
         """
-        try:
-            scalar = asscalar(value)
-        except ValueError as e:
-            raise TypeError from e
-
-        super(Parameter, self).check_type(scalar)
+        vtype = type(value)
+        if vtype not in _PLAIN_TYPES:
+            convert = _SCALAR_TYPES.get(vtype)
+            if convert is not None:
+                value = convert(value)
+            else:
+                try:
+                    value = asscalar(value)
+                except ValueError as e:
+                    raise TypeError from e
+
+        type_checker(self._meta['dtype'])(value)
 
     # Comparison Methods
     def __eq__(self, x):
@@ -677,17 +862,62 @@ class Parameter(Property):
         """
         return yaml.dump(self)
 
+Param = Parameter
+
+
+class FloatParameter(Parameter):
+    """Parameter sub-class restricted to real values, which are
+    stored as `float`.
+
+    Setting a float value costs little more than the bounds check.
+    Other real numbers (int, numpy scalars and size 1 arrays) are
+    converted to float, and anything else raises TypeError.
+
+    """
+
+    __slots__ = ()
+
+    defaults = deepcopy(Parameter.defaults)
+    idx = [d[0] for d in defaults].index('dtype')
+    defaults[idx] = ('dtype', float, 'Data type')
+
+    @defaults_decorator(defaults)
+    def __init__(self, **kwargs):
+        super(FloatParameter, self).__init__(**kwargs)
+
     @staticmethod
-    def representer(dumper, data):
-        """
-        http://stackoverflow.com/a/14001707/4075339
-        http://stackoverflow.com/a/21912744/4075339
+    def _to_float(value):
+        """Convert a real number to float, raising TypeError otherwise"""
+        if type(value) in _REAL_TYPES:
+            return float(value)
+        try:
+            scalar = asscalar(value)
+        except ValueError as e:
+            raise TypeError from e
+        if not isinstance(scalar, Real):
+            msg = "Value of type %s, when %s was expected." % (type(value), float)
+            raise TypeError(msg)
+        return float(scalar)
+
+    def check_type(self, value):
+        """Hook for type-checking, raises TypeError if value can not
+        be converted to float.
         """
-        tag = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
-        return dumper.represent_mapping(
-            tag, data.todict().items(), flow_style=True)
+        if type(value) is float or is_none(value):
+            return
+        self._to_float(value)
 
-Param = Parameter
+    def set_value(self, value):
+        """Set the value, converting it to float"""
+        if type(value) is not float:
+            if is_none(value):
+                self.__value__ = None
+                return
+            value = self._to_float(value)
+        bounds = self.__bounds__
+        if bounds is not None and not bounds[0] <= value <= bounds[1]:
+            self.check_bounds(value)
+        self.__value__ = value
 
 
 def odict_representer(dumper, data):
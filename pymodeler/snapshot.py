@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Binary snapshots of Python objects with large numpy arrays.
+
+Objects are pickled with protocol 5, with the buffers of the arrays
+out-of-band: the arrays are written to the file after the pickle,
+unchanged (so that writing a snapshot costs about a `write` of the
+array bytes), and aligned so that they can be memory-mapped.
+
+By default, `load` memory-maps the file and the arrays are read-only
+views onto it, so nothing is read from disk until it is used. The
+file stays mapped (and open) until these arrays are freed.
+
+Out-of-band buffers need Python 3.8 (pickle protocol 5). With older
+versions the arrays are pickled in-band, and snapshots written with
+out-of-band buffers cannot be loaded.
+
+File layout::
+
+    MAGIC
+    pickle size, number of buffers        (2 x uint64)
+    offset and size of each buffer        (2 x uint64 per buffer)
+    pickle
+    buffers (each aligned to ALIGN bytes)
+
+Examples::
+
+    from pymodeler import snapshot
+    snapshot.dump(obj, 'obj.snap')
+    obj = snapshot.load('obj.snap')
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import mmap
+import pickle
+import struct
+import tempfile
+
+MAGIC = b'PYMSNAP1'
+ALIGN = 64
+# Can the arrays be written out-of-band?
+OUT_OF_BAND = pickle.HIGHEST_PROTOCOL >= 5
+
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def dump(obj, filename):
+    """
+    Write a snapshot of an object.
+
+    The file is written to a temporary name and renamed into place,
+    so a reader never sees a partial snapshot.
+
+    Parameters
+    ----------
+    obj :
+        The object (picklable).
+    filename : str
+        The file name.
+    """
+    buffers = []
+    if OUT_OF_BAND:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    else:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    raws = [b.raw() for b in buffers]
+
+    table = []
+    offset = _aligned(len(MAGIC) + 16 + 16 * len(raws) + len(data))
+    for raw in raws:
+        table += [offset, raw.nbytes]
+        offset = _aligned(offset + raw.nbytes)
+    header = MAGIC + struct.pack('<%iQ' % (2 + len(table)), len(data), len(raws), *table)
+
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(data)
+            for (start, _), raw in zip(zip(table[::2], table[1::2]), raws):
+                f.seek(start)
+                f.write(raw)
+        os.replace(tmpname, filename)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+
+def load(filename, mmap_mode=True):
+    """
+    Read a snapshot written by `dump`.
+
+    Parameters
+    ----------
+    filename : str
+        The file name.
+    mmap_mode : bool
+        Memory-map the file, so that arrays are read lazily (as
+        read-only views onto the file). Otherwise the file is read
+        into memory.
+
+    Returns
+    -------
+    obj :
+        The object.
+    """
+    mapped = None
+    with open(filename, 'rb') as f:
+        if mmap_mode:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+        else:
+            view = memoryview(bytearray(f.read()))
+
+    start = len(MAGIC)
+    if view[:start].tobytes() != MAGIC:
+        raise ValueError("Not a snapshot file: %s" % filename)
+    size, nbuffers = struct.unpack_from('<2Q', view, start)
+    start += 16
+    table = struct.unpack_from('<%iQ' % (2 * nbuffers), view, start)
+    start += 16 * nbuffers
+    if not nbuffers:
+        # Nothing refers to the file once unpickled: unmap it
+        with view[start:start + size] as data:
+            obj = pickle.loads(data)
+        view.release()
+        if mapped is not None:
+            mapped.close()
+        return obj
+    if not OUT_OF_BAND:
+        raise ValueError("Snapshot with out-of-band buffers (needs Python 3.8): %s"
+                         % filename)
+    buffers = [view[o:o + n] for o, n in zip(table[::2], table[1::2])]
+    return pickle.loads(view[start:start + size], buffers=buffers)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Contiguous array storage for the Parameters of a Model.
+
+A `ParameterArray` keeps the values, bounds, errors and free status
+of a set of Parameters in contiguous numpy arrays. Each Parameter of
+a Model instance is then a `ParameterView` onto one slot of the
+arrays.
+
+Missing values, bounds and errors (i.e., None) are stored as NaN.
+"""
+from __future__ import absolute_import, division, print_function
+
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler.parameter import Parameter
+
+
+class ParameterArray:
+    """Contiguous storage for the state of a set of Parameters.
+
+    Attributes
+    ----------
+    names : tuple
+        The parameter names, in storage order.
+    index : dict
+        Mapping from parameter name to slot.
+    values : `~numpy.ndarray`
+        Parameter values, shape (n,).
+    bounds : `~numpy.ndarray`
+        Lower and upper bounds, shape (n, 2).
+    errors : `~numpy.ndarray`
+        Lower and upper errors, shape (n, 2).
+    free : `~numpy.ndarray`
+        Free/fixed status, shape (n,).
+    """
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.index = odict([(n, i) for i, n in enumerate(self.names)])
+        size = len(self.names)
+        self.values = np.full(size, np.nan)
+        self.bounds = np.full((size, 2), np.nan)
+        self.errors = np.full((size, 2), np.nan)
+        self.free = np.zeros(size, dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_params(cls, params):
+        """Build the storage for the Parameter objects in an
+        '~collections.OrderedDict' of properties.
+
+        Raises TypeError if a Parameter can not be stored as a float.
+        """
+        names = [k for k, p in params.items() if isinstance(p, Parameter)]
+        array = cls(names)
+        for i, name in enumerate(names):
+            param = params[name]
+            dtype = param.dtype
+            if dtype is not None and not isinstance(0.0, dtype):
+                msg = "Parameter %s of type %s can not be stored in an array"
+                raise TypeError(msg % (name, dtype))
+            ParameterView.bind(param, array, i).set(
+                value=param.value, bounds=param.bounds,
+                errors=param.errors, free=param.free)
+        return array
+
+    def copy(self):
+        """Return a copy of the storage (not sharing any arrays)"""
+        new = self.__class__.__new__(self.__class__)
+        new.names = self.names
+        new.index = self.index
+        new.values = self.values.copy()
+        new.bounds = self.bounds.copy()
+        new.errors = self.errors.copy()
+        new.free = self.free.copy()
+        return new
+
+
+def _pair(row):
+    """Convert a row of the bounds or errors arrays to a list or None"""
+    low, high = row.tolist()
+    if low != low and high != high:
+        return None
+    return [low, high]
+
+
+class ParameterView(Parameter):
+    """Parameter whose state is stored in one slot of a `ParameterArray`.
+
+    The metadata record (help, format, dtype, etc.) is shared with
+    the Parameter it is bound from.
+    """
+
+    __slots__ = ('_array', '_index')
+
+    @classmethod
+    def bind(cls, param, array, index):
+        """Create a view onto slot `index` of `array`, taking the
+        attributes of `param`.
+        """
+        view = cls.__new__(cls)
+        view._meta = param._meta
+        view._array = array
+        view._index = index
+        return view
+
+    @property
+    def __value__(self):
+        value = self._array.values.item(self._index)
+        return None if value != value else value
+
+    @__value__.setter
+    def __value__(self, value):
+        self._array.values[self._index] = np.nan if value is None else value
+
+    @property
+    def __bounds__(self):
+        return _pair(self._array.bounds[self._index])
+
+    @__bounds__.setter
+    def __bounds__(self, bounds):
+        self._array.bounds[self._index] = np.nan if bounds is None else bounds
+
+    @property
+    def __errors__(self):
+        return _pair(self._array.errors[self._index])
+
+    @__errors__.setter
+    def __errors__(self, errors):
+        self._array.errors[self._index] = np.nan if errors is None else errors
+
+    @property
+    def __free__(self):
+        return bool(self._array.free[self._index])
+
+    @__free__.setter
+    def __free__(self, free):
+        self._array.free[self._index] = free
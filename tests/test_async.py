@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Test the async loaders
+"""
+import asyncio
+from collections import OrderedDict as odict
+
+from pymodeler import Model, Param, Property, Derived
+
+
+class Remote(Model):
+    _params = odict([('x', Param(value=1., bounds=[0, 10])),
+                     ('label', Property(dtype=str, default='a')),
+                     ('calib', Derived(dtype=float)),
+                     ('other', Derived(dtype=float)),
+                     ('scaled', Derived(dtype=float)),
+                     ('local', Derived(dtype=float))])
+    nload = 0
+
+    def __init__(self, **kwargs):
+        # Set when the loaders of calib and other are both running
+        self.started = []
+        super(Remote, self).__init__(**kwargs)
+
+    async def wait_for(self, other):
+        self.started.append(other)
+        while other not in self.started:
+            await asyncio.sleep(0.001)
+
+    async def _calib(self):
+        Remote.nload += 1
+        x = self.x
+        await asyncio.sleep(0.01)
+        await self.wait_for('other')
+        return 10 * x
+
+    async def _other(self):
+        await self.wait_for('calib')
+        return self.x + 1
+
+    async def _scaled(self):
+        return await self.aget('calib') * 2
+
+    def _local(self):
+        return self.x * 3
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_aget():
+    m = Remote(x=2.)
+    assert Remote._coroutines == frozenset(['calib', 'other', 'scaled'])
+    assert run(m.aget('x')) == 2. and run(m.aget('local')) == 6.
+
+    async def concurrent():
+        Remote.nload = 0
+        values = await asyncio.gather(*[m.aget('calib') for _ in range(5)],
+                                      m.aget('other'))
+        assert values == [20.] * 5 + [3.]
+        assert Remote.nload == 1
+    run(concurrent())
+
+    # Dependencies are traced per task
+    assert run(m.aget('scaled')) == 40.
+    assert m.dependencies('calib') == ('x',)
+    assert m.dependencies('scaled') == ('calib',)
+    m.label = 'b'
+    assert m.calib == 20.
+    m.x = 3.
+    assert m.last_invalidated == ('calib', 'other', 'scaled', 'local')
+
+    # Outside of an event loop, the loader is run to completion
+    m.started.append('other')
+    assert m.calib == 30.
+
+    async def blocking():
+        m.x = 4.
+        return m.calib
+    try: run(blocking())
+    except RuntimeError: pass
+    else: raise RuntimeError("Failed to catch RuntimeError in Derived.value")
+
+
+def test_amaterialize():
+    m = Remote(x=2.)
+    run(m.amaterialize())
+    assert m.calib == 20. and m.other == 3. and m.scaled == 40. and m.local == 6.
+    m.x = 3.
+    m.started = []
+    run(m.amaterialize(['scaled', 'other']))
+    assert m.scaled == 60. and m.other == 4.
+    try: run(m.amaterialize(['x']))
+    except KeyError: pass
+    else: raise KeyError("Failed to catch KeyError in amaterialize")
+
+
+def test_cancel():
+    m = Remote(x=2.)
+    m.started.append('other')
+
+    async def change():
+        Remote.nload = 0
+        task = asyncio.ensure_future(m.aget('calib'))
+        await asyncio.sleep(0.005)
+        # The loader has read x: it is started again
+        m.x = 3.
+        assert await task == 30.
+        assert Remote.nload == 2
+
+        # Changing a property that was not read does not cancel it
+        m.x = 4.
+        task = asyncio.ensure_future(m.aget('calib'))
+        await asyncio.sleep(0.005)
+        m.label = 'c'
+        assert await task == 40.
+        assert Remote.nload == 3
+
+        # Cancelling one caller does not cancel the others
+        m.x = 5.
+        first = asyncio.ensure_future(m.aget('calib'))
+        second = asyncio.ensure_future(m.aget('calib'))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        assert await second == 50.
+        assert first.cancelled() and Remote.nload == 4
+
+        # clear_derived cancels all the loaders
+        m.clear_derived()
+        task = asyncio.ensure_future(m.aget('calib'))
+        await asyncio.sleep(0.005)
+        m.clear_derived()
+        assert await task == 50.
+        assert Remote.nload == 6
+        assert not m._tasks
+    run(change())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Test the model batch
+"""
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler import Model, ModelBatch
+from pymodeler import Param, Property, Derived
+
+
+class Trip(Model):
+    _params = odict([('fuel_rate', Property(default=10., dtype=float)),
+                     ('fuel_type', Property(default="diesel", dtype=str)),
+                     ('distance', Param(value=10., bounds=[0, 1000])),
+                     ('fuel_needed', Derived(dtype=float, vectorized=True)),
+                     ('label', Derived(dtype=str))])
+    _mapping = odict([('dist', 'distance')])
+
+    def _fuel_needed(self):
+        return self.distance / self.fuel_rate
+
+    def _label(self):
+        return "%s:%.0f" % (self.fuel_type, self.distance)
+
+
+def test_batch():
+    dist = np.linspace(0, 100, 11)
+    batch = ModelBatch(Trip, dist=dist)
+    assert len(batch) == 11
+    assert np.all(batch.distance == dist)
+    assert np.all(batch.fuel_rate == 10.)
+    assert batch.fuel_type[0] == 'diesel'
+
+    # Vectorized loader
+    assert np.allclose(batch.fuel_needed, dist / 10.)
+
+    # Row-by-row loader
+    labels = batch.label
+    assert labels[1] == 'diesel:10'
+    assert len(labels) == 11
+
+    # Setting a column clears the derived values
+    batch.set_column('fuel_rate', 5.)
+    assert np.allclose(batch.fuel_needed, dist / 5.)
+
+    m = batch.row(3)
+    assert isinstance(m, Trip)
+    assert m.distance == 30. and m.fuel_rate == 5.
+    assert m.fuel_needed == batch.fuel_needed[3]
+
+    # 8 bytes per row for each column and derived float
+    batch = ModelBatch(Trip, size=1000, distance=1.)
+    batch.fuel_needed
+    assert batch.nbytes == 2 * 8 * 1000
+
+
+def test_batch_checks():
+    try: ModelBatch(Trip, distance=[1., 2000.])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+
+    try: ModelBatch(Trip, distance=['a', 'b'])
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError")
+
+    # Columns fail like the single Models do
+    try: Trip(distance='1.5')
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError")
+    try: ModelBatch(Trip, distance=['1.5', '2'])
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError for strings")
+
+    try: ModelBatch(Trip, distance=[1., np.nan])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch NaN outside bounds")
+
+    try: ModelBatch(Trip, size=2, fuel_needed=1.)
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError for Derived")
+
+    try: ModelBatch(Trip, speed=[1.])
+    except KeyError: pass
+    else: raise KeyError("Failed to catch KeyError")
+
+    batch = ModelBatch(Trip, size=2)
+    try: batch.speed
+    except AttributeError: pass
+    else: raise AttributeError("Failed to catch AttributeError")
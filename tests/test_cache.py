@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Test the caches for Derived properties
+"""
+import os
+import shutil
+import tempfile
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler import Model, Param, Derived
+from pymodeler.cache import LRUCache, DiskCache
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    # 'b' was the least recently used
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+    info = cache.info()
+    assert info['hits'] == 2
+    assert info['misses'] == 1
+    assert info['evictions'] == 1
+    assert info['size'] == 2
+
+    cache = LRUCache(maxsize=10, maxbytes=2000)
+    cache.put('a', np.zeros(100))
+    cache.put('b', np.zeros(100))
+    assert cache.nbytes == 1600
+    cache.put('c', np.zeros(100))
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    # Too large to be cached at all
+    cache.put('d', np.zeros(1000))
+    assert 'd' not in cache
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_disk_cache():
+    path = tempfile.mkdtemp()
+    try:
+        cache = DiskCache(path)
+        key = cache.key('a', 1.0)
+        assert key == DiskCache.key('a', 1.0)
+        assert key != DiskCache.key('a', 2.0)
+
+        assert cache.get(key) is None
+        cache.put(key, np.arange(10.))
+        value = cache.get(key)
+        assert isinstance(value, np.memmap)
+        assert np.all(value == np.arange(10.))
+
+        cache.put(cache.key('b'), {'b': 2})
+        assert cache.get(cache.key('b')) == {'b': 2}
+        # Values that can't be pickled are skipped
+        cache.put(cache.key('c'), lambda: None)
+        assert cache.get(cache.key('c')) is None
+
+        info = cache.info()
+        assert info['hits'] == 2 and info['misses'] == 2
+        assert info['size'] == 2
+
+        # Make 'key' the least recently used
+        os.utime(cache._filename(key, '.npy'), (0, 0))
+        cache.evict(cache.nbytes - 1)
+        assert cache.get(key) is None
+        assert cache.get(cache.key('b')) == {'b': 2}
+
+        cache.clear()
+        assert cache.nbytes == 0
+    finally:
+        shutil.rmtree(path)
+
+
+class Spectrum(Model):
+    _params = odict([('norm', Param(value=1.)),
+                     ('index', Param(value=-2.)),
+                     ('spectrum', Derived(dtype=np.ndarray, disk_cache=True,
+                                          version=1, depends=['index'])),
+                     ('total', Derived(dtype=float, disk_cache=True))])
+    calls = 0
+
+    def _spectrum(self):
+        Spectrum.calls += 1
+        return np.arange(1., 100.)**self.index
+
+    def _total(self):
+        Spectrum.calls += 1
+        return self.norm * self.spectrum.sum()
+
+
+def test_model_disk_cache():
+    path = tempfile.mkdtemp()
+    try:
+        Spectrum._disk_cache = DiskCache(path)
+        m = Spectrum()
+        total = m.total
+        assert Spectrum.calls == 2
+        m.norm = 2.
+        assert m.total == 2 * total
+        assert Spectrum.calls == 3
+
+        # A new instance (or job) finds the values on disk
+        m = Spectrum(norm=2.)
+        assert m.total == 2 * total
+        assert Spectrum.calls == 3
+        assert isinstance(m.spectrum, np.memmap)
+        assert Spectrum._disk_cache.info()['hits'] == 2
+    finally:
+        Spectrum._disk_cache = None
+        shutil.rmtree(path)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Test the instrumentation
+"""
+import json
+from collections import OrderedDict as odict
+
+from pymodeler import Model, Param, Derived
+from pymodeler import instrument
+from pymodeler.model import Model as BaseModel
+
+
+class Timed(Model):
+    _params = odict([('x', Param(value=1.)),
+                     ('y', Param(value=2.)),
+                     ('total', Derived(dtype=float))])
+
+    def _total(self):
+        return self.x + self.y
+
+
+def test_instrument():
+    setp = BaseModel.setp
+    instrument.reset()
+    instrument.enable()
+    try:
+        assert instrument.enabled()
+        assert BaseModel.setp is not setp
+        m = Timed(x=2.)
+        m.setp('y', value=3.)
+        m.y = 4.
+        m.total
+        m.todict()
+        m.dump()
+    finally:
+        instrument.disable()
+    assert not instrument.enabled()
+    assert BaseModel.setp is setp
+
+    # Nothing is counted while disabled
+    Timed()
+
+    stats = instrument.snapshot()['Timed']
+    assert stats['__init__']['calls'] == 1
+    assert stats['setp']['calls'] == 1
+    assert stats['setp']['by_name']['y']['calls'] == 1
+    # set_attributes sets scalar values directly
+    assert stats['setattr']['by_name']['x']['calls'] == 1
+    assert stats['setattr']['by_name']['y']['calls'] == 1
+    assert stats['loader']['by_name']['total']['calls'] == 1
+    assert stats['dump']['calls'] == 1
+    assert stats['todict']['calls'] == 1
+    assert stats['set_attributes']['time'] > 0
+
+    assert json.loads(instrument.to_json())['Timed']['setp']['calls'] == 1
+    instrument.reset()
+    assert instrument.snapshot() == odict()
+
+
+class SharedTimed(Timed):
+    _threadsafe = True
+
+
+def test_instrument_threadsafe():
+    instrument.reset()
+    instrument.enable()
+    try:
+        # Defined while the instrumentation is enabled
+        class LateTimed(Timed):
+            _background_cache = 0.01
+        for cls in (SharedTimed, LateTimed):
+            m = cls()
+            m.setp('y', value=3.)
+            m.x = 4.
+            m.clear_derived()
+            m.wait_cache()
+    finally:
+        instrument.disable()
+
+    # Nothing is counted once disabled
+    m = LateTimed()
+    m.setp('y', value=3.)
+    m.x = 5.
+    m.clear_derived()
+    m.wait_cache()
+
+    stats = instrument.snapshot()
+    for name in ('SharedTimed', 'LateTimed'):
+        assert stats[name]['setp']['calls'] == 1
+        assert stats[name]['setattr']['by_name']['x']['calls'] == 1
+        assert stats[name]['clear_derived']['calls'] == 1
@@ -6,6 +6,10 @@ from pymodeler import Model
 from pymodeler import Param, Property, Derived
 from collections import OrderedDict as odict
 
+import copy
+
+import numpy as np
+
 class Parent(Model):
     _params = odict([('x', Param(value=1               , help='variable x')),
                      ('y', Param(value=2, bounds=[0,10], help='variable y'))])
@@ -121,3 +125,737 @@ def test_model():
     try: bad = Child(vv=dict(value=3))
     except KeyError: pass
     else: raise TypeError("Failed to catch KeyError in Model.set_attributes")
+
+
+def test_set_attributes():
+    class Config(Model):
+        _params = odict([('x', Param(value=1., bounds=[0, 10])),
+                         ('opts', Property(dtype=dict, default={})),
+                         ('label', Property(dtype=str, default='a'))])
+        _mapping = odict([('xx', 'x')])
+
+    # Scalars, dicts of fields and aliases
+    c = Config(xx=dict(value=2., free=True), label=dict(value='b'),
+               opts={'value': 3})
+    assert c.free_names() == ('x',)
+    assert c.x == 2. and c.getp('x').free
+    assert c.label == 'b'
+    assert c.opts == {'value': 3}
+
+    # Unknown names become attributes
+    c = Config(other=[1, 2])
+    assert c.other == [1, 2]
+
+    for kwargs in [dict(x='a'), dict(x=dict(value='a')), dict(label=3)]:
+        try: Config(**kwargs)
+        except TypeError as msg: assert 'Failed to set parameter' in str(msg)
+        else: raise TypeError("Failed to catch TypeError in Model.set_attributes")
+
+    try: Config(x=dict(value=20.))
+    except ValueError: pass
+    else: raise ValueError("Failed to catch ValueError in Model.set_attributes")
+
+
+def test_from_records():
+    rows = [dict(x=1.5, y=2), dict(x=2.5, y=3, name='b'), dict(y=dict(value=4, free=True))]
+    models = Parent.from_records(rows)
+    for row, model in zip(rows, models):
+        expected = Parent(**row)
+        assert model.todict() == expected.todict()
+    assert models[1].name == 'b'
+    assert models[2].free_names() == ('y',)
+
+    # Structured arrays and columns
+    array = np.array([(1., 2.), (3., 4.)], dtype=[('x', float), ('y', float)])
+    for records in [array, dict(x=array['x'], y=[2., 4.])]:
+        models = Parent.from_records(records)
+        assert [m.x for m in models] == [1., 3.]
+        assert [m.y for m in models] == [2., 4.]
+
+    # Models sharing a prototype do not share its state
+    models[0].getp('y').bounds[0] = -1.
+    assert Parent._params['y'].bounds[0] == 0
+
+    # Errors give the index of the record
+    for records, error in [(dict(y=[1., 20.]), ValueError),
+                           (dict(x=[1., 'a']), TypeError),
+                           ([dict(x=1.), dict(x=dict(value='a'))], TypeError),
+                           (dict(opt=[1., 2.]), ValueError)]:
+        cls = test_class if 'opt' in records else Parent
+        try: cls.from_records(records)
+        except error as msg: assert 'Record 1' in str(msg) or 'Record 0' in str(msg)
+        else: raise error("Failed to catch error in Model.from_records")
+
+    # Sub-classes that change how the attributes are set get the same
+    # calls as from their constructor
+    class Logged(Parent):
+        def _set_value(self, name, value):
+            self.__dict__.setdefault('log', []).append(name)
+            super(Logged, self)._set_value(name, value)
+    models = Logged.from_records(dict(x=[1.5, 2.5], y=[3., 4.]))
+    assert [m.log for m in models] == [['x', 'y'], ['x', 'y']]
+    assert models[0].log == Logged(x=1.5, y=3.).log
+
+    # Array storage and the process pool
+    class ArrayParent(Parent):
+        _array_storage = True
+    models = ArrayParent.from_records(dict(x=[1., 2.], y=[3., 4.]))
+    assert [m.param_values().tolist() for m in models] == [[1., 3.], [2., 4.]]
+    models = Parent.from_records(dict(x=np.arange(5.)), processes=2, chunksize=2)
+    assert [m.x for m in models] == list(range(5))
+
+
+def test_records():
+    dtype = Child.record_dtype()
+    assert dtype.names == ('x', 'y', 'z')
+    assert dtype['y'].names == ('value', 'errors', 'bounds', 'free')
+
+    a = Child(x=dict(value=3., errors=[0.1, 0.2], free=True), y=4.)
+    record = a.to_record()
+    assert record['x']['value'] == 3. and record['x']['free']
+    assert np.isnan(record['z']['value'])
+
+    b = Child.from_record(record)
+    assert b.todict() == a.todict()
+    assert b.z is None and b.getp('y').bounds == [0, 10]
+
+    # Stack the records, write them to a file and map them back
+    import tempfile, os
+    records = np.array([Child(x=float(i)).to_record() for i in range(5)])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'records.npy')
+        np.save(filename, records)
+        mapped = np.load(filename, mmap_mode='r')
+        assert Child.from_record(mapped[3]).x == 3.
+        del mapped
+
+    # Other Properties are not stored
+    assert test_class.record_dtype().names == ('var',)
+    t = test_class.from_record(test_class(req=1., var=2.).to_record(), req=1.)
+    assert t.var == 2. and t.der == 2.
+
+    # Parameters that are not floats
+    class Flag(Model):
+        _params = odict([('flag', Param(value=True, dtype=bool))])
+    try: Flag.record_dtype()
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError in Model.record_dtype")
+
+
+def test_yaml():
+    import tempfile, os
+    t = test_class(req=2., var=dict(value=np.float64(3.), bounds=[0, 10], free=True))
+    u = test_class.from_yaml(t.dump())
+    assert u.req == 2. and u.var == 3. and u.der == 6.
+    assert u.getp('var').bounds == [0, 10] and u.getp('var').free
+    assert u.dump() == t.dump()
+
+    # Stream of documents, written and read one at a time
+    models = (Child(x=float(i), z=dict(value=1., errors=[0.1, 0.2])) for i in range(10))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'models.yaml')
+        with open(filename, 'w') as stream:
+            Child.dump_all(models, stream)
+        loaded = Child.load_all(filename)
+        assert next(loaded).x == 0.
+        assert [m.x for m in loaded] == list(range(1, 10))
+        with open(filename, 'w') as stream:
+            t.dump(stream)
+        assert test_class.load(filename).der == 6.
+
+
+class NoDerived(test_class):
+    _pickle_derived = False
+
+
+def test_pickle():
+    import pickle
+    for cls in (test_class, NoDerived):
+        t = cls(req=2., var=dict(value=3., free=True))
+        t.extra = 'x'
+        assert t.der == 6.
+        u = pickle.loads(pickle.dumps(t))
+        assert type(u) is cls and u.extra == 'x'
+        assert u.getp('var').free and u.free_names() == ('var',)
+        # Loaders are bound to the new instance
+        assert u.getp('der').loader.__self__ is u
+        assert (u._owned['der'].__value__ is None) == (cls is NoDerived)
+        assert u.der == 6.
+        u.req = 1.
+        assert u.der == 3. and t.der == 6.
+
+    # Copies do not share any state
+    v = copy.copy(t)
+    v.var = 4.
+    assert t.var == 3.
+    assert copy.deepcopy(t).der == 6.
+
+
+def test_map_derived():
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    t = test_class(req=2., opt=3.)
+    points = [dict(var=float(i)) for i in range(10)]
+    expected = [6. * i for i in range(10)]
+
+    values = t.map_derived('der', points)
+    assert isinstance(values, np.ndarray) and values.tolist() == expected
+    with ThreadPoolExecutor(2) as pool:
+        assert t.map_derived('der', dict(var=np.arange(10.)), executor=pool,
+                             chunksize=3).tolist() == expected
+    with ProcessPoolExecutor(2) as pool:
+        assert t.map_derived('der', points, executor=pool).tolist() == expected
+    # The instance is not changed
+    assert t.var == 1. and t.der == 6.
+
+    # Each point starts from the state of the instance
+    mixed = [dict(var=2.), dict(opt=4.), dict(var=dict(value=3., bounds=[0, 5])),
+             dict(opt=1.)]
+    single = [t.map_derived('der', [p])[0] for p in mixed]
+    assert single == [12., 8., 18., 2.]
+    for chunksize in (1, 2, 4):
+        assert t.map_derived('der', mixed, chunksize=chunksize).tolist() == single
+
+    # Non-numeric values
+    class Label(Model):
+        _params = odict([('x', Param(value=1.)), ('label', Derived(dtype=str))])
+        def _label(self):
+            return 'x=%s' % self.x
+    assert Label().map_derived('label', dict(x=[1., 2.])) == ['x=1.0', 'x=2.0']
+
+    # Errors for each point
+    points[3] = dict(var='a')
+    try: t.map_derived('der', points)
+    except TypeError as msg: assert 'Point 3' in str(msg)
+    else: raise TypeError("Failed to catch TypeError in Model.map_derived")
+    values = t.map_derived('der', points, errors='return')
+    assert isinstance(values[3], TypeError) and values[4] == 24.
+
+
+def test_copy_on_write():
+    a = Parent()
+    b = Parent()
+
+    # Nothing is copied until it is written
+    assert a.x == 1
+    assert 'x' not in a._owned
+
+    a.x = 3
+    assert a.x == 3
+    assert b.x == 1
+    assert Parent._params['x'].value == 1
+
+    # Properties handed out by getp are private copies
+    a.getp('y').set_bounds([0, 100])
+    assert b.getp('y').bounds == [0, 10]
+    assert Parent._params['y'].bounds == [0, 10]
+
+    # Mutable values are never shared with the defaults
+    t = test_class(req=1.)
+    t2 = test_class(req=1.)
+    assert t.der == t2.der == 1.
+    t.var = 3.
+    assert t.der == 3.
+    assert t2.der == 1.
+    assert test_class._params['var'].value == 1.
+    assert test_class._params['der'].loader is None
+
+    class Mutable(Model):
+        _params = odict([('cfg', Property(default={'a': 1}, dtype=dict))])
+
+    m = Mutable()
+    m.cfg['a'] = 2
+    assert Mutable().cfg['a'] == 1
+    assert Mutable._params['cfg'].value == {'a': 1}
+
+    # Changing a prototype changes the instances that share it
+    class Shared(Model):
+        _params = odict([('x', Param(value=1.)), ('y', Param(value=1.))])
+
+    a, b = Shared(), Shared(x=2.)
+    Shared._params['x'].set_value(5.)
+    Shared._params['y'].set_value(6.)
+    assert a.x == 5. and a.y == 6.
+    assert b.x == 2. and b.y == 6.
+    assert Shared().x == 5.
+
+
+def test_accessors():
+    from pymodeler.model import PropertyAccessor
+
+    assert isinstance(Child.zed, PropertyAccessor)
+    assert Child.zed.name == 'z'
+
+    b = Child(zed=3)
+    assert b.z == 3
+    b.zed = 4
+    assert b.z == 4
+    assert b.getp('z').value == 4
+
+    # Other attributes are stored on the instance
+    b.other = 'value'
+    assert b.other == 'value'
+    assert 'other' in b.__dict__
+
+    # Parameters dropped by a sub-class are not accessible
+    class Reduced(Child):
+        _params = odict([('x', Param(value=1))])
+        _mapping = odict([])
+
+    r = Reduced()
+    try: r.zed
+    except AttributeError: pass
+    else: raise TypeError("Failed to catch AttributeError for dropped parameter")
+    assert r.x == 1
+
+    try: b.x = 'afda'
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError in Model.__set__")
+
+
+def test_added_params():
+    class Growing(Model):
+        _params = odict([('x', Param(value=1.))])
+
+    a = Growing()
+    Growing._params['w'] = Param(value=1.)
+    m = Growing(w=2.)
+    assert m.w == 2. and m.getp('w').value == 2.
+    assert m.param_values().tolist() == [1., 2.]
+    assert 'w' not in m.__dict__
+
+    # Instances built before the change
+    Growing._params['v'] = Param(value=0.)
+    a.set_attributes(v=3.)
+    assert a.v == 3. and a.getp('v').value == 3.
+    assert a.param_values().tolist() == [1., 1., 3.]
+
+
+class Chain(Model):
+    _params = odict([('a', Param(value=1.)),
+                     ('b', Param(value=2.)),
+                     ('c', Param(value=3.)),
+                     ('d1', Derived(dtype=float)),
+                     ('d2', Derived(dtype=float)),
+                     ('d3', Derived(dtype=float, depends=['b']))])
+
+    def __init__(self, **kwargs):
+        self.calls = dict(d1=0, d2=0, d3=0)
+        super(Chain, self).__init__(**kwargs)
+
+    def _d1(self):
+        self.calls['d1'] += 1
+        return self.a * 2
+
+    def _d2(self):
+        self.calls['d2'] += 1
+        return self.d1 + 1
+
+    def _d3(self):
+        self.calls['d3'] += 1
+        return self.b * self.getp('c').value
+
+
+def test_dependencies():
+    m = Chain()
+    deps = m.dependencies()
+    assert deps['d1'] is None
+    assert deps['d3'] == ('b',)
+
+    assert m.d2 == 3.
+    assert m.d3 == 6.
+    assert m.dependencies('d1') == ('a',)
+    assert m.dependencies('d2') == ('d1',)
+    assert m.dependents('a') == ('d1', 'd2')
+    assert m.dependents('b') == ('d3',)
+
+    # Only the downstream values are cleared
+    m.c = 4.
+    assert m.last_invalidated == ()
+    assert m.d2 == 3.
+    assert m.calls == dict(d1=1, d2=1, d3=1)
+
+    m.a = 2.
+    assert m.last_invalidated == ('d1', 'd2')
+    assert m.d3 == 6.
+    assert m.d2 == 5.
+    assert m.calls == dict(d1=2, d2=2, d3=1)
+
+    m.setp('b', value=3.)
+    assert m.last_invalidated == ('d3',)
+    assert m.d3 == 12.
+
+    m.clear_derived()
+    assert m.last_invalidated == ('d1', 'd2', 'd3')
+
+
+
+class Bulk(Model):
+    _params = odict([('a', Param(value=1., free=True)),
+                     ('b', Param(value=2., errors=[0.1, 0.2])),
+                     ('by_view', Derived(dtype=float)),
+                     ('by_params', Derived(dtype=float)),
+                     ('by_values', Derived(dtype=float)),
+                     ('by_errors', Derived(dtype=float)),
+                     ('by_free', Derived(dtype=float)),
+                     ('by_dict', Derived(dtype=float)),
+                     ('memoized', Derived(dtype=float, memo=10))])
+
+    def _by_view(self):
+        return self.params['a'].value
+
+    def _by_params(self):
+        return sum(p.value for p in self.get_params())
+
+    def _by_values(self):
+        return self.param_values(['b']).sum()
+
+    def _by_errors(self):
+        return self.param_errors(['b']).sum() + self.param_values(['b'])[0]
+
+    def _by_free(self):
+        return self.free_values().sum()
+
+    def _by_dict(self):
+        return self.todict()['b'].value
+
+    def _memoized(self):
+        return sum(self.param_values())
+
+
+def test_bulk_dependencies():
+    m = Bulk()
+    assert m.by_view == 1.
+    assert m.dependencies('by_view') == ('a',)
+    m.a = 10.
+    assert m.by_view == 10.
+
+    assert m.by_params == 12.
+    assert m.dependencies('by_params') == ('a', 'b')
+    m.b = 3.
+    assert m.by_params == 13.
+
+    assert m.by_values == 3.
+    assert m.dependencies('by_values') == ('b',)
+    m.b = 4.
+    assert m.by_values == 4.
+
+    assert np.isclose(m.by_errors, 4.3)
+    assert m.dependencies('by_errors') == ('b',)
+    m.b = 5.
+    assert np.isclose(m.by_errors, 5.3)
+
+    assert m.by_free == 10.
+    assert m.dependencies('by_free') == ('a',)
+    m.a = 1.
+    assert m.by_free == 1.
+
+    assert m.by_dict == 5.
+    assert 'b' in m.dependencies('by_dict')
+    m.b = 2.
+    assert m.by_dict == 2.
+
+    # The fingerprint of the memo covers the traced inputs
+    assert m.memoized == 3.
+    assert m.dependencies('memoized') == ('a', 'b')
+    m.a = 10.
+    assert m.memoized == 12.
+    m.a = 1.
+    assert m.memoized == 3.
+    assert m.memo_info('memoized')['hits'] == 1
+
+
+class Tabulated(Model):
+    _params = odict([('x', Param(value=1.)),
+                     ('y', Param(value=1.)),
+                     ('d', Derived(dtype=float)),
+                     ('memoized', Derived(dtype=float, memo=10)),
+                     ('constant', Derived(dtype=float))])
+
+    def _cache(self, name=None):
+        self.table = 10 * self.x
+
+    def _d(self):
+        return self.table
+
+    def _memoized(self):
+        return self.table + self.y
+
+    def _constant(self):
+        return self.scale
+
+
+def test_untraced_state():
+    # The loaders read state computed by _cache: every change clears them
+    m = Tabulated()
+    assert m.d == 10. and m.memoized == 11.
+    assert m.dependencies('d') is None
+    m.x = 2.
+    assert m.last_invalidated == ('d', 'memoized')
+    assert m.d == 20. and m.memoized == 21.
+    m.x = 1.
+    assert m.memoized == 11.
+
+    # A loader that reads no property is never narrowed
+    class Scaled(Tabulated):
+        _trace_dependencies = True
+    m = Scaled()
+    m.scale = 2.
+    assert m.constant == 2.
+    assert m.dependencies('constant') is None
+    m.scale = 3.
+    m.y = 2.
+    assert m.constant == 3.
+    # ... but the class trusts the other traces
+    assert m.memoized == 12. and m.dependencies('memoized') == ('y',)
+    m.x = 2.
+    assert m.memoized == 12.
+
+def test_set_param_values():
+    a = Parent()
+    a.set_param_values([2, 3])
+    assert a.x == 2 and a.y == 3
+    assert a.param_values().tolist() == [2, 3]
+
+    # Nothing is set if any of the values are bad
+    try: a.set_param_values([4, 11])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+    assert a.x == 2
+
+    try: a.set_param_values(['x', 1])
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError")
+
+
+class Fit(Model):
+    _params = odict([('norm', Param(value=1., bounds=[0, 10], free=True)),
+                     ('index', Param(value=-2., free=True)),
+                     ('shift', Param(value=0.)),
+                     ('flux', Derived(dtype=float))])
+
+    def __init__(self, **kwargs):
+        self.ncache = 0
+        super(Fit, self).__init__(**kwargs)
+
+    def _flux(self):
+        return self.norm * 10**self.index + self.shift
+
+    def _cache(self, name=None):
+        self.ncache += 1
+
+
+def test_free_values():
+    m = Fit()
+    assert m.free_names() == ('norm', 'index')
+    assert m.free_values().tolist() == [1., -2.]
+    bounds = m.free_bounds()
+    assert bounds[0].tolist() == [0, 10]
+    assert bounds[1].tolist() == [-np.inf, np.inf]
+
+    assert m.flux == 0.01
+    ncache = m.ncache
+    m.set_free_values([2., -1.])
+    assert m.ncache == ncache + 1
+    assert m.norm == 2. and m.index == -1.
+    assert m.flux == 0.2
+
+    m.setp('shift', free=True)
+    m.setp('index', free=False)
+    assert m.free_names() == ('norm', 'shift')
+    m.getp('index').set_free(True)
+    assert m.free_names() == ('norm', 'index', 'shift')
+    # Changing a Parameter handed out earlier
+    index = m.getp('index')
+    assert m.free_names() == ('norm', 'index', 'shift')
+    index.set(free=False)
+    assert m.free_names() == ('norm', 'shift')
+    index.set(free=True)
+
+    try: m.set_free_values([1., 2.])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch wrong number of values")
+
+
+def test_batch_update():
+    m = Fit()
+    assert m.flux == 0.01
+    ncache = m.ncache
+
+    with m.batch_update():
+        m.norm = 2.
+        m.setp('index', value=-1., errors=[0.1, 0.1])
+        m.shift = 1.
+        # Derived properties are cleared at the end of the batch
+        assert m.flux == 0.01
+    assert m.ncache == ncache + 1
+    assert m.last_invalidated == ('flux',)
+    assert m.flux == 1.2
+
+    # Roll back on errors
+    try:
+        with m.batch_update():
+            m.norm = 3.
+            m.setp('index', errors=[0.2, 0.2], free=False)
+            m.norm = 20.
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+    assert m.norm == 2.
+    assert m.getp('index').errors == [0.1, 0.1]
+    assert m.free_names() == ('norm', 'index')
+    assert m.ncache == ncache + 1
+    assert m.flux == 1.2
+
+    m.update(norm=4., shift=dict(value=2., free=True))
+    assert m.ncache == ncache + 2
+    assert m.flux == 2.4
+    assert m.free_names() == ('norm', 'index', 'shift')
+
+    try: m.update(norm=5., index='a')
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError in Model.update")
+    assert m.norm == 4.
+
+    # Unchanged parameters fall back to the defaults
+    f = Fit()
+    try: f.update(shift=1., norm=-1.)
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+    assert f.shift == 0.
+
+
+class Memo(Model):
+    _params = odict([('a', Param(value=1.)),
+                     ('b', Param(value=2.)),
+                     ('d1', Derived(dtype=float, memo=2)),
+                     ('d2', Derived(dtype=float, memo=10))])
+
+    def __init__(self, **kwargs):
+        self.calls = dict(d1=0, d2=0)
+        super(Memo, self).__init__(**kwargs)
+
+    def _d1(self):
+        self.calls['d1'] += 1
+        return self.a * 2
+
+    def _d2(self):
+        self.calls['d2'] += 1
+        return self.d1 + self.b
+
+
+def test_memo():
+    m = Memo()
+    assert m.d2 == 4.
+    m.a = 2.
+    assert m.d2 == 6.
+    assert m.calls == dict(d1=2, d2=2)
+
+    # Returning to an earlier point is a memo hit
+    m.a = 1.
+    assert m.d2 == 4.
+    assert m.calls == dict(d1=2, d2=2)
+    assert m.memo_info('d2')['hits'] == 1
+    assert m.memo_info('d1')['hits'] == 0
+
+    m.b = 3.
+    assert m.d2 == 5.
+    assert m.calls == dict(d1=2, d2=3)
+
+    m.a = 3.
+    m.d2
+    m.a = 4.
+    m.d2
+    info = m.memo_info()
+    assert info['d1']['evictions'] == 2
+    assert info['d1']['size'] == 2
+    assert info['d2']['misses'] == 5
+
+
+class Spectrum(Model):
+    _params = odict([('norm', Param(value=1., bounds=[0, 100])),
+                     ('index', Param(value=1., bounds=[-5, 5])),
+                     ('label', Property(dtype=str, default='a')),
+                     ('flux', Derived(dtype=np.ndarray)),
+                     ('total', Derived(dtype=float, updater='rescale_total'))])
+
+    def __init__(self, **kwargs):
+        self.calls = dict(flux=0, update=0, total=0, rescale=0)
+        super(Spectrum, self).__init__(**kwargs)
+
+    def _flux(self):
+        self.calls['flux'] += 1
+        return self.norm * np.arange(1., 5.)**-self.index
+
+    def _flux_update(self, old, changes):
+        self.calls['update'] += 1
+        self.changes = changes
+        if list(changes) != ['norm']:
+            return NotImplemented
+        old_norm, new_norm = changes['norm']
+        return old * (new_norm / old_norm)
+
+    def _total(self):
+        self.calls['total'] += 1
+        return self.flux.sum()
+
+    def rescale_total(self, old, changes):
+        self.calls['rescale'] += 1
+        return NotImplemented
+
+
+def test_incremental():
+    m = Spectrum(norm=2.)
+    assert Spectrum._updaters == dict(flux='_flux_update', total='rescale_total')
+    flux = m.flux
+    assert m.calls['flux'] == 1
+
+    # Only norm changed: the value is updated
+    m.norm = 3.
+    m.norm = 4.
+    assert np.allclose(m.flux, flux * 2.)
+    assert m.changes == odict(norm=(2., 4.))
+    assert m.calls['flux'] == 1 and m.calls['update'] == 1
+    # The inputs of the Derived properties it depends on
+    assert m.total == m.flux.sum()
+    m.norm = 5.
+    assert m.total == m.flux.sum()
+    assert m.calls['rescale'] == 1 and m.calls['total'] == 2
+
+    # index changed as well: the loader is called
+    m.setp('norm', value=1.)
+    m.index = 2.
+    assert np.allclose(m.flux, np.arange(1., 5.)**-2.)
+    assert list(m.changes) == ['norm', 'index']
+    assert m.calls['flux'] == 2 and m.calls['update'] == 3
+
+    # Back to the same point: the previous value is kept
+    flux = m.flux
+    m.norm = 2.
+    m.norm = 1.
+    assert m.flux is flux and m.calls['update'] == 3
+
+    # Unrelated changes and rolled-back batches do not call anything
+    m.label = 'b'
+    try:
+        with m.batch_update():
+            m.norm = 3.
+            raise ValueError()
+    except ValueError: pass
+    assert m.flux is flux and m.calls['update'] == 3
+
+    # clear_derived computes the values from scratch
+    m.clear_derived()
+    m.flux
+    assert m.calls['flux'] == 3 and m.calls['update'] == 3
+
+    # So does a copy (the previous values are not part of the state)
+    n = copy.deepcopy(m)
+    n.norm = 2.
+    n.flux
+    assert n.calls['flux'] == 4 and n.calls['update'] == 3
+    n.norm = 4.
+    assert np.allclose(n.flux, 2 * m.flux * 2)
+    assert n.calls['flux'] == 4 and n.calls['update'] == 4
+
+    # Evaluating at many points uses the updater
+    values = m.map_derived('total', dict(norm=np.arange(1., 11.)))
+    assert np.allclose(values, np.arange(1., 11.) * m.total)
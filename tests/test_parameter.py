@@ -3,7 +3,7 @@
 Test the parameters
 """
 
-from pymodeler import Parameter, Param, Property, Derived
+from pymodeler import Parameter, Param, Property, Derived, FloatParameter
 from collections import OrderedDict as odict
 import yaml
 
@@ -219,6 +219,64 @@ def test_parameter_operators():
 
 
 
+def test_type_fast_path():
+    import numpy as np
+    # The fast paths give the same results as asscalar
+    param = Parameter(value=1, dtype=int)
+    param.set_value(np.int64(2))
+    param.set_value(np.array([3]))
+    try: param.set_value(np.float64(2.))
+    except TypeError: pass
+    else: raise TypeError
+
+    param = Parameter(value=1.)
+    for value in [2, 2., np.float32(2.), np.float64(2.), True, [2.]]:
+        param.set_value(value)
+    try: param.set_value('2')
+    except TypeError: pass
+    else: raise TypeError
+
+    # Values of a FloatParameter are converted to float
+    param = FloatParameter(value=1, bounds=[0, 10])
+    assert type(param.value) is float
+    for value in [2, np.int64(2), np.float32(2.), np.array([2.])]:
+        param.set_value(value)
+        assert type(param.value) is float and param.value == 2.
+    for value in ['2', 1j, [1., 2.]]:
+        try: param.set_value(value)
+        except TypeError: pass
+        else: raise TypeError
+    try: param.set_value(11.)
+    except ValueError: pass
+    else: raise ValueError
+    param.set_value(None)
+    assert param.value is None
+
+
+def test_compact():
+    param = Parameter(value=1., bounds=[0, 2], help="A parameter")
+
+    # No per-instance dictionary
+    try: param.other = 1
+    except AttributeError: pass
+    else: raise AttributeError("Parameter should not have a __dict__")
+
+    # Copies share the metadata record, but not the state
+    import copy
+    other = copy.deepcopy(param)
+    assert other._meta is param._meta
+    assert other.help == "A parameter"
+    other.set(value=2., bounds=[1, 3])
+    assert param.value == 1. and param.bounds == [0, 2]
+
+    # Setting metadata only changes the copy
+    other.help = "Another parameter"
+    assert param.help == "A parameter"
+    assert other._meta is not param._meta
+
+    deriv = copy.copy(Derived(dtype=float, loader=lambda: 3.))
+    assert deriv.value == 3.
+
 
 
 def test_docs():
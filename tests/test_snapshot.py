@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Test the binary snapshots
+"""
+import os
+import pickle
+import tempfile
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler import Model, Param, Property, Derived
+from pymodeler import snapshot
+
+
+class Warm(Model):
+    _params = odict([('x', Param(value=1., bounds=[0, 10])),
+                     ('label', Property(dtype=str, default='a', required=True)),
+                     ('grid', Derived(dtype=np.ndarray))])
+    nload = 0
+
+    def _grid(self):
+        Warm.nload += 1
+        return np.linspace(0, 1, 1000) * self.x
+
+
+class ArrayWarm(Warm):
+    _array_storage = True
+
+
+def test_snapshot():
+    data = dict(a=np.arange(10.), b=[np.ones((3, 3)), 'text'])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'data.snap')
+        snapshot.dump(data, filename)
+        for mmap_mode in (True, False):
+            loaded = snapshot.load(filename, mmap_mode)
+            assert np.all(loaded['a'] == data['a'])
+            assert loaded['b'][0].shape == (3, 3) and loaded['b'][1] == 'text'
+        # Memory-mapped arrays are read-only
+        loaded = snapshot.load(filename)
+        assert not loaded['a'].flags.writeable
+        del loaded
+
+        # Without out-of-band buffers (e.g., before Python 3.8)
+        snapshot.OUT_OF_BAND = False
+        try:
+            snapshot.dump(data, filename)
+        finally:
+            snapshot.OUT_OF_BAND = pickle.HIGHEST_PROTOCOL >= 5
+        for mmap_mode in (True, False):
+            loaded = snapshot.load(filename, mmap_mode)
+            assert np.all(loaded['a'] == data['a'])
+            assert loaded['a'].flags.writeable
+
+        # The file is not kept open when it holds no buffers
+        if os.path.isdir('/proc/self/fd'):
+            nfiles = len(os.listdir('/proc/self/fd'))
+            loaded = [snapshot.load(filename) for _ in range(10)]
+            assert len(os.listdir('/proc/self/fd')) == nfiles
+            del loaded
+
+        with open(filename, 'wb') as f:
+            f.write(b'something else')
+        try: snapshot.load(filename)
+        except ValueError: pass
+        else: raise ValueError("Failed to catch ValueError in snapshot.load")
+
+
+def test_model_snapshot():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'model.snap')
+        for cls in (Warm, ArrayWarm):
+            m = cls(x=dict(value=2., free=True), label='b')
+            m.extra = 3
+            grid = m.grid
+            Warm.nload = 0
+
+            m.save_snapshot(filename)
+            n = cls.load_snapshot(filename)
+            assert type(n) is cls
+            assert n.x == 2. and n.getp('x').free and n.getp('x').bounds == [0, 10]
+            assert n.label == 'b' and n.extra == 3
+            assert n.free_names() == ('x',)
+
+            # The Derived value is restored, not recomputed
+            assert np.all(n.grid == grid)
+            assert Warm.nload == 0
+            assert not n.grid.flags.writeable
+
+            # ... and depends on x
+            n.label = 'c'
+            assert n.last_invalidated == ()
+            n.x = 3.
+            assert n.last_invalidated == ('grid',)
+            assert n.grid[-1] == 3. and Warm.nload == 1
+            assert m.x == 2.
+
+        # Snapshots can be loaded by a base class, but not a sub-class
+        Warm(label='d').save_snapshot(filename)
+        assert type(Model.load_snapshot(filename)) is Warm
+        try: ArrayWarm.load_snapshot(filename)
+        except TypeError: pass
+        else: raise TypeError("Failed to catch TypeError in Model.load_snapshot")
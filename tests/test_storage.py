@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Test the array storage of parameters
+"""
+from collections import OrderedDict as odict
+
+import numpy as np
+
+from pymodeler import Model, Param, Property, Derived
+from pymodeler.storage import ParameterArray, ParameterView
+
+
+class ArrayModel(Model):
+    _array_storage = True
+    _params = odict([('x', Param(value=1., bounds=[0, 10], free=True)),
+                     ('y', Param(value=2., errors=[0.1, 0.2])),
+                     ('z', Param(value=None)),
+                     ('label', Property(default='model', dtype=str)),
+                     ('total', Derived(dtype=float))])
+    _mapping = odict([('ex', 'x')])
+
+    def _total(self):
+        return self.x + self.y
+
+
+def test_parameter_array():
+    params = ArrayModel._params
+    array = ParameterArray.from_params(params)
+    assert array.names == ('x', 'y', 'z')
+    assert np.all(array.values[:2] == [1., 2.])
+    assert np.isnan(array.values[2])
+    assert array.free.tolist() == [True, False, False]
+
+    copy = array.copy()
+    copy.values[0] = 5.
+    assert array.values[0] == 1.
+
+    view = ParameterView.bind(params['y'], array, 1)
+    assert view.value == 2.
+    assert view.errors == [0.1, 0.2]
+    assert view.bounds is None
+    view.set(value=3., bounds=[0, 5])
+    assert array.values[1] == 3.
+    assert array.bounds[1].tolist() == [0, 5]
+    try: view.set_value(6.)
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+
+    # Only float parameters can be stored in arrays
+    try: ParameterArray.from_params(odict(n=Param(value=1, dtype=int)))
+    except TypeError: pass
+    else: raise TypeError("Failed to catch TypeError for int parameter")
+
+
+def test_array_model():
+    a = ArrayModel(x=2.)
+    b = ArrayModel()
+
+    assert a.x == a.ex == 2.
+    assert b.x == 1.
+    assert a.z is None
+    assert a.total == 4.
+
+    vals = a.param_values()
+    assert vals.dtype == float
+    assert vals[:2].tolist() == [2., 2.]
+    assert a.param_values(['y', 'label']).tolist() == [2.]
+    assert a.param_errors()[1].tolist() == [0.1, 0.2]
+
+    # Returned arrays are copies
+    vals[0] = 3.
+    assert a.x == 2.
+
+    a.set_param_values([3., 4., 5.])
+    assert a.x == 3. and a.y == 4. and a.z == 5.
+    assert a.getp('x').value == 3.
+    assert a.total == 7.
+
+    a.set_param_values([1.], ['x'])
+    assert a.last_invalidated == ('total',)
+    assert a.total == 5.
+
+    # Nothing is set if any of the values are bad
+    try: a.set_param_values([11., 0., 0.])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+    assert a.param_values().tolist() == [1., 4., 5.]
+
+    try: a.set_param_values([1., 2.])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch wrong number of values")
+
+    # The same checks as without array storage
+    try: a.set_param_values([np.nan, 0., 0.])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch NaN outside bounds")
+    for values in (['3', 0., 0.], [1., 'none', 0.], [1j, 0., 0.]):
+        try: a.set_param_values(values)
+        except TypeError: pass
+        else: raise ValueError("Failed to catch TypeError for %s" % values)
+    assert a.param_values().tolist() == [1., 4., 5.]
+    # Parameters without bounds can be unset
+    a.set_param_values([2, None, np.nan])
+    assert a.x == 2. and a.y is None and a.z is None
+    a.set_param_values([1., 4., 5.])
+
+    # Parameters are views onto the arrays
+    p = a.getp('y')
+    p.set_free(True)
+    assert a._array.free.tolist() == [True, True, False]
+    a.ex = 8.
+    assert p.value == 4.
+    assert a.getp('x').value == 8.
+    assert b.param_values()[:2].tolist() == [1., 2.]
+
+    # Records
+    c = ArrayModel.from_record(a.to_record())
+    assert c.param_values().tolist() == a.param_values().tolist()
+    assert np.array_equal(c.param_errors(), a.param_errors(), equal_nan=True)
+
+
+def test_array_free_values():
+    a = ArrayModel()
+    assert a.free_names() == ('x',)
+    assert a.free_values().tolist() == [1.]
+    assert a.free_bounds().tolist() == [[0., 10.]]
+    a.set_free_values([3.])
+    assert a.x == 3.
+    a.setp('y', free=True)
+    assert a.free_names() == ('x', 'y')
+    assert a.free_bounds()[1].tolist() == [-np.inf, np.inf]
+    y = a.getp('y')
+    assert a.free_names() == ('x', 'y')
+    y.set(free=False)
+    assert a.free_names() == ('x',)
+
+
+def test_array_batch_update():
+    a = ArrayModel()
+    assert a.total == 3.
+    try:
+        with a.batch_update():
+            a.set_param_values([2., 3., 4.])
+            a.setp('y', value=3., bounds=[0, 1])
+    except ValueError: pass
+    else: raise ValueError("Failed to catch bounds error")
+    assert a.param_values()[:2].tolist() == [1., 2.]
+    assert a.getp('y').bounds is None
+    assert a.total == 3.
+
+    with a.batch_update():
+        a.x = 5.
+        a.y = 1.
+    assert a.total == 6.
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+"""
+Test sharing models between threads
+"""
+import sys
+import copy
+import time
+import threading
+from collections import OrderedDict as odict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pymodeler import Model, Param, Derived
+
+
+class Shared(Model):
+    _params = odict([('a', Param(value=0., bounds=[-1e6, 1e6])),
+                     ('b', Param(value=0., bounds=[-1e6, 1e6])),
+                     ('diff', Derived(dtype=float)),
+                     ('slow', Derived(dtype=np.ndarray)),
+                     ('total', Derived(dtype=float))])
+    _threadsafe = True
+    nload = 0
+
+    def _diff(self):
+        a = self.a
+        # Give the writers a chance to run between the two reads
+        time.sleep(0)
+        return a - self.b
+
+    def _slow(self):
+        Shared.nload += 1
+        time.sleep(0.05)
+        return np.arange(10) * self.a
+
+    def _total(self):
+        return self.slow.sum() + self.diff
+
+
+class ArrayShared(Shared):
+    _array_storage = True
+
+
+def run_threads(target, nthreads, *args):
+    errors = []
+
+    def wrapped():
+        try:
+            target(*args)
+        except Exception as err: # pylint: disable=broad-except
+            errors.append(err)
+    threads = [threading.Thread(target=wrapped) for _ in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_single_flight():
+    for cls in (Shared, ArrayShared):
+        m = cls(a=2.)
+        Shared.nload = 0
+        barrier = threading.Barrier(8)
+        values = []
+
+        def read():
+            barrier.wait()
+            m.total
+            values.append(m.slow)
+        run_threads(read, 8)
+        assert Shared.nload == 1
+        assert all(v is values[0] for v in values)
+        assert values[0][1] == 2.
+
+        # The dependencies traced in each thread are kept apart
+        assert m.dependencies('total') == ('diff', 'slow')
+        m.a = 3.
+        assert m.last_invalidated == ('diff', 'slow', 'total')
+        assert m.slow[1] == 3. and Shared.nload == 2
+
+
+def test_stress():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for cls in (Shared, ArrayShared):
+            stress(cls)
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def stress(cls):
+    m = cls()
+    stop = threading.Event()
+    nwrites = 300
+
+    def write():
+        for i in range(nwrites):
+            if i % 3 == 0:
+                with m.batch_update():
+                    m.a = float(i)
+                    time.sleep(0)
+                    m.b = float(i)
+            elif i % 3 == 1:
+                m.set_param_values([float(i), float(i)], ['a', 'b'])
+            else:
+                m.clear_derived()
+        stop.set()
+
+    def read():
+        # The Derived values never mix two parameter points
+        while not stop.is_set():
+            assert m.diff == 0., m.diff
+            assert m.total % 45 == 0., m.total
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    run_threads(read, 4)
+    writer.join()
+    assert m.diff == 0. and m.slow[1] == m.a
+
+    # A batch is atomic, even when it fails
+    try:
+        with m.batch_update():
+            m.a = 1e5
+            raise RuntimeError()
+    except RuntimeError: pass
+    assert m.a != 1e5 and m.diff == 0.
+
+
+def test_copy():
+    m = Shared(a=1.)
+    m.slow
+    n = copy.deepcopy(m)
+    assert n._lock is not m._lock
+    assert n.slow[1] == 1.
+    n.a = 2.
+    assert n.slow[1] == 2. and m.slow[1] == 1.
+
+
+class Wide(Model):
+    _params = odict([('x', Param(value=1., bounds=[0, 10])),
+                     ('u', Derived(dtype=float)),
+                     ('v', Derived(dtype=float)),
+                     ('w', Derived(dtype=float, depends=['x'])),
+                     ('sum', Derived(dtype=float))])
+    nload = 0
+
+    def __init__(self, **kwargs):
+        # The loaders of u, v and w only return once all three run
+        self.barrier = threading.Barrier(3, timeout=5)
+        super(Wide, self).__init__(**kwargs)
+
+    def load(self, scale):
+        Wide.nload += 1
+        self.barrier.wait()
+        return scale * self.x
+
+    def _u(self):
+        return self.load(1.)
+
+    def _v(self):
+        return self.load(2.)
+
+    def _w(self):
+        return self.load(3.)
+
+    def _sum(self):
+        Wide.nload += 1
+        return self.u + self.v + self.w
+
+
+def test_materialize():
+    m = Wide(x=2.)
+    Wide.nload = 0
+    # The dependencies of sum are not known yet
+    assert m._levels(['sum']) == [['sum']]
+    m.materialize()
+    assert Wide.nload == 4
+    assert m.sum == 12. and Wide.nload == 4
+    assert m.dependencies('sum') == ('u', 'v', 'w')
+    # Not thread-safe outside of materialize
+    assert m._trace == [] and '_lock' not in m.__dict__
+
+    m.x = 3.
+    assert m.last_invalidated == ('u', 'v', 'w', 'sum')
+    assert m._levels(['sum']) == [['u', 'v', 'w'], ['sum']]
+    with ThreadPoolExecutor(3) as pool:
+        m.materialize(['sum'], executor=pool)
+    assert Wide.nload == 8
+    assert m.sum == 18.
+
+    # Nothing to compute
+    m.materialize()
+    assert Wide.nload == 8
+
+    try: m.materialize(['x'])
+    except KeyError: pass
+    else: raise KeyError("Failed to catch KeyError in materialize")
+
+    # The exceptions of the loaders are raised
+    m.barrier = threading.Barrier(4, timeout=0.1)
+    m.x = 4.
+    try: m.materialize()
+    except threading.BrokenBarrierError: pass
+    else: raise ValueError("Failed to catch BrokenBarrierError in materialize")
+
+
+class Interactive(Model):
+    _params = odict([('a', Param(value=0., bounds=[-1e6, 1e6])),
+                     ('b', Param(value=0., bounds=[-1e6, 1e6])),
+                     ('slow', Derived(dtype=float))])
+    _background_cache = 0.05
+    # The hook does not compute anything the loaders read
+    _trace_dependencies = True
+    nload = 0
+
+    def __init__(self, **kwargs):
+        self.cached = []
+        super(Interactive, self).__init__(**kwargs)
+
+    def _slow(self):
+        Interactive.nload += 1
+        a = self.a
+        time.sleep(0.2)
+        return a * 10
+
+    def _cache_many(self, names):
+        self.cached.append((names, threading.get_ident()))
+
+
+def test_background_cache():
+    assert Interactive._threadsafe
+    m = Interactive()
+    assert m.wait_cache(5) and m.slow == 0.
+    Interactive.nload = 0
+    del m.cached[:]
+
+    # Rapid changes are debounced into one update, in another thread
+    m.a = 1.
+    m.b = 1.
+    m.a = 2.
+    assert m.cached == []
+    assert m.wait_cache(5)
+    assert Interactive.nload == 1
+    assert m.cached[0][0] == ('a', 'b') and len(m.cached) == 1
+    assert m.cached[0][1] != threading.get_ident()
+    # Computed in the background
+    assert m.slow == 20. and Interactive.nload == 1
+
+    # A read waits for the computation in progress
+    m.a = 3.
+    time.sleep(0.1)
+    assert m.slow == 30. and Interactive.nload == 2
+
+    # A newer change supersedes the computation in progress
+    m.a = 4.
+    time.sleep(0.1)
+    m.a = 5.
+    assert m.wait_cache(5)
+    assert Interactive.nload == 4
+    assert m.slow == 50. and Interactive.nload == 4
+
+    # Changes that do not clear a Derived value only call the hook
+    m.b = 2.
+    assert m.wait_cache(5)
+    assert m.cached[-1][0] == ('b',) and Interactive.nload == 4
+
+    # The setting is not part of the state
+    n = copy.deepcopy(m)
+    assert n.wait_cache(0) and n.slow == 50.
+
+
+
+class Failing(Interactive):
+    _background_cache = 0.01
+
+    def _cache_many(self, names):
+        if self.a < 0:
+            raise ValueError(names)
+        super(Failing, self)._cache_many(names)
+
+
+def test_background_cache_error():
+    m = Failing()
+    assert m.wait_cache(5)
+
+    # The error of the hook is raised by wait_cache, once
+    m.a = -1.
+    try: m.wait_cache(5)
+    except ValueError as err: assert err.args == (('a',),)
+    else: raise ValueError("Failed to raise the error of _cache_many")
+    assert m.wait_cache(5)
+
+    # ... or by the next change, which is still applied
+    m.a = -2.
+    time.sleep(0.2)
+    try: m.a = 1.
+    except ValueError as err: assert err.args == (('a',),)
+    else: raise ValueError("Failed to raise the error of _cache_many")
+    assert m.wait_cache(5)
+    assert m.a == 1. and m.cached[-1][0] == ('a',)
+    assert m.slow == 10.
+
+class Memoized(Model):
+    _params = odict([('x', Param(value=0., bounds=[-10, 10])),
+                     ('y', Derived(dtype=float, memo=10))])
+    _threadsafe = True
+
+    def __init__(self, **kwargs):
+        self.reading = threading.Event()
+        self.written = threading.Event()
+        super(Memoized, self).__init__(**kwargs)
+
+    def _y(self):
+        x = self.x
+        if not self.written.is_set():
+            # Let x change while the loader runs
+            self.reading.set()
+            self.written.wait(5)
+        return x * 10
+
+
+def test_memo_write():
+    m = Memoized()
+
+    def write():
+        m.reading.wait(5)
+        m.x = 1.
+        m.written.set()
+    writer = threading.Thread(target=write)
+    writer.start()
+    # The value computed for x=0 is dropped, and not memoized for x=1
+    assert m.y == 10.
+    writer.join()
+    assert m.memo_info('y')['size'] == 1
+    m.x = 0.
+    assert m.y == 0.
+    m.x = 1.
+    assert m.y == 10. and m.memo_info('y')['hits'] == 1